@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 from typing import List, Optional
 
-from ..schemas import ClubBrief, ApplicationSuggestions, model_to_dict
-from .llm_utils import call_openai_json
+from ..schemas import ClubBrief, ApplicationSuggestions
+from .llm_utils import acall_llm_json, salvage_reply
+from .prompting import model_json
+from ..tracing import annotate
 
 
 SYSTEM_PROMPT = (
@@ -16,20 +17,27 @@ SYSTEM_PROMPT = (
 async def run(brief: ClubBrief, questions: Optional[List[str]]) -> ApplicationSuggestions:
     print(f"[ApplicationCoachAgent] start questions_count={(len(questions) if questions else 0)}")
     user_prompt = (
-        "ClubBrief:\n" + json.dumps(model_to_dict(brief), indent=2) + "\n\n"
+        "ClubBrief:\n" + model_json(brief) + "\n\n"
         + "Application questions (if any):\n" + ("\n".join(questions or []) or "(none provided)") + "\n\n"
         + "Keep examples concise (≤150 words)."
     )
 
     print("[ApplicationCoachAgent] calling LLM for strategies...")
-    data = call_openai_json(SYSTEM_PROMPT, user_prompt)
+    data = await acall_llm_json(SYSTEM_PROMPT, user_prompt, schema=ApplicationSuggestions)
     if data:
-        try:
-            return ApplicationSuggestions(**data)
-        except Exception:
-            print("[ApplicationCoachAgent] LLM JSON parse failed, using fallback")
+        result = salvage_reply(
+            "ApplicationCoachAgent", ApplicationSuggestions, data, lambda: heuristic(brief, questions)
+        )
+        if result is not None:
+            return result
+
+    print("[ApplicationCoachAgent] using heuristic fallback")
+    annotate(outcome="fallback")
+    return heuristic(brief, questions)
 
-    # Fallback
+
+def heuristic(brief: ClubBrief, questions: Optional[List[str]]) -> ApplicationSuggestions:
+    """Template strategies for each question built from the brief."""
     values_alignment = [
         {"value": v, "how_to_show_it": "Show measurable impact, teamwork, and initiative in relevant stories."}
         for v in (brief.mission_values or [])[:3]
@@ -49,7 +57,6 @@ async def run(brief: ClubBrief, questions: Optional[List[str]]) -> ApplicationSu
             }
         )
 
-    print("[ApplicationCoachAgent] using heuristic fallback")
     return ApplicationSuggestions(
         club_rundown=brief.overview,
         values_alignment=values_alignment,
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ..schemas import ClubBrief, ResumeSuggestions, ApplicationSuggestions, InterviewPrep, model_to_dict
+from .llm_utils import acall_llm_json, default_max_tokens
+from .prompting import fit, model_json
+from ..tracing import annotate
+
+
+SYSTEM_PROMPT = (
+    "You are an application coach. Given a ClubBrief, resume text and "
+    "application questions, return one JSON object with three sections:\n"
+    "resume: {top5_fixes[], tailored_bullets[], format_warnings[], ATS_suggestions[]} "
+    "(strict resume review tailored to the club's keywords and what_matters_most);\n"
+    "application: {club_rundown, values_alignment[{value, how_to_show_it}], "
+    "question_strategies[{question, structure, do_donts[], example_answer≤150 words}]};\n"
+    "interview: {similar_experiences_summary, likely_questions[], stories_to_prepare[], "
+    "quick_pitch_template, followup_questions[], links[]}"
+)
+
+
+class CoachingBundle(BaseModel):
+    """Reply schema for the combined request (sections are validated one by one)."""
+
+    resume: ResumeSuggestions
+    application: ApplicationSuggestions
+    interview: InterviewPrep
+
+
+SECTIONS = {
+    "resume": ResumeSuggestions,
+    "application": ApplicationSuggestions,
+    "interview": InterviewPrep,
+}
+
+
+async def run(
+    brief: ClubBrief,
+    resume_text: str,
+    questions: Optional[List[str]],
+    club_name: Optional[str] = None,
+    school_name: Optional[str] = None,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """One LLM round trip for all three coaching sections.
+
+    Returns each section as a validated dict, or None for sections that were
+    missing or failed validation; the orchestrator runs the separate agent for
+    those.
+    """
+    print(f"[FusedCoachAgent] start questions_count={(len(questions) if questions else 0)}")
+    sys = SYSTEM_PROMPT.replace(
+        "You are an application coach.",
+        f"You are an application coach for {club_name or 'the club'} at {school_name or 'the school'}.",
+    )
+    user_prompt = (
+        "ClubBrief:\n" + model_json(brief) + "\n\n"
+        + "Resume text (first pages):\n" + fit("resume", resume_text) + "\n\n"
+        + "Application questions (if any):\n" + ("\n".join(questions or []) or "(none provided)") + "\n\n"
+        + "Keep examples concise (≤150 words)."
+    )
+
+    print("[FusedCoachAgent] calling LLM for combined coaching...")
+    # Three sections in one reply: a single agent's output cap would cut it off
+    data = await acall_llm_json(
+        sys, user_prompt, schema=CoachingBundle, max_tokens=len(SECTIONS) * default_max_tokens()
+    ) or {}
+    sections: Dict[str, Optional[Dict[str, Any]]] = {}
+    for name, model in SECTIONS.items():
+        part = data.get(name)
+        sections[name] = None
+        if not isinstance(part, dict):
+            continue
+        if name == "resume":
+            # Same caps the resume tailor applies
+            part["top5_fixes"] = (part.get("top5_fixes") or [])[:5]
+            part["tailored_bullets"] = (part.get("tailored_bullets") or [])[:8]
+        try:
+            sections[name] = model_to_dict(model(**part))
+        except Exception:
+            print(f"[FusedCoachAgent] section {name} failed validation")
+
+    failed = [name for name, part in sections.items() if part is None]
+    if failed:
+        print(f"[FusedCoachAgent] falling back to separate agents for: {', '.join(failed)}")
+        annotate(outcome="partial" if len(failed) < len(SECTIONS) else "fallback", fallback_sections=failed)
+    return sections
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import os
+import threading
+from typing import List, Optional
 
-from ..schemas import InstagramFindings
+from ..cache import DiskCache
+from ..schemas import InstagramFindings, model_to_dict
 from ..tools.fetch_url import fetch_html, extract_visible_text
-from .llm_utils import call_openai_json
+from ..tools.instagram_extract import InstagramProfile, handle_from_url, parse_profile
+from .llm_utils import PartialReply, acall_llm_json, salvage_reply
+from .prompting import compact_json, fit
+from ..tracing import annotate
 
 
 SYSTEM_PROMPT = (
@@ -14,36 +21,84 @@ SYSTEM_PROMPT = (
 )
 
 
+# Findings per handle: a repeat lookup within the TTL skips fetch and LLM
+_snapshots: Optional[DiskCache] = None
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot_cache() -> Optional[DiskCache]:
+    """Per-handle findings cache; disabled with INSTAGRAM_SNAPSHOT_TTL=0."""
+    global _snapshots
+    ttl = float(os.getenv("INSTAGRAM_SNAPSHOT_TTL", str(6 * 3600)))
+    if ttl <= 0:
+        return None
+    with _snapshots_lock:
+        if _snapshots is None:
+            _snapshots = DiskCache("instagram_snapshots", default_ttl=ttl)
+    return _snapshots
+
+
 async def run(instagram_url: Optional[str], is_online: bool = True) -> InstagramFindings:
     print(f"[InstagramAgent] start url={instagram_url} online={is_online}")
     if not instagram_url:
         return InstagramFindings(warnings=["No Instagram URL provided."])
 
+    handle = handle_from_url(instagram_url)
+    snapshots = get_snapshot_cache() if is_online and handle else None
+    if snapshots is not None:
+        cached = await asyncio.to_thread(snapshots.get, handle)
+        if cached is not None:
+            print(f"[InstagramAgent] snapshot hit for @{handle}")
+            annotate(instagram_snapshot="hit")
+            return InstagramFindings(**cached)
+
     html = ""
     if is_online:
         print("[InstagramAgent] fetching HTML...")
-        html = fetch_html(instagram_url)
-    text = extract_visible_text(html) if html else ""
+        html = await asyncio.to_thread(fetch_html, instagram_url)
+    profile = await asyncio.to_thread(parse_profile, html, handle) if html else InstagramProfile(handle)
+    if profile.has_signal():
+        # Login-wall chrome carries nothing; send only the structured fields
+        text = profile.text()
+        content = f"Profile (structured):\n{compact_json(profile.payload())}"
+    else:
+        text = await asyncio.to_thread(extract_visible_text, html) if html else ""
+        content = f"HTML/Text (truncated):\n{fit('instagram', text)}"
 
     user_prompt = (
         f"URL: {instagram_url}\n\n"
-        f"HTML/Text (truncated):\n{text[:6000]}\n\n"
+        f"{content}\n\n"
         "Focus on mission signals, recruiting hints, and events."
     )
 
     print("[InstagramAgent] calling LLM for JSON parse...")
-    data = call_openai_json(SYSTEM_PROMPT, user_prompt)
+    data = await acall_llm_json(SYSTEM_PROMPT, user_prompt, schema=InstagramFindings)
     if data:
-        try:
-            return InstagramFindings(**data)
-        except Exception:
-            print("[InstagramAgent] LLM JSON parse failed, using fallback")
+        used_fallback: List[bool] = []
+
+        def _fallback() -> InstagramFindings:
+            used_fallback.append(True)
+            return heuristic(html, text)
+
+        result = salvage_reply("InstagramAgent", InstagramFindings, data, _fallback)
+        if result is not None:
+            # Only clean LLM findings from a complete reply are worth reusing
+            clean = not used_fallback and not isinstance(data, PartialReply)
+            if snapshots is not None and clean and html and "FETCH_ERROR" not in html:
+                await asyncio.to_thread(snapshots.set, handle, model_to_dict(result))
+            return result
 
     # Heuristic fallback
     print("[InstagramAgent] using heuristic fallback")
+    annotate(outcome="fallback")
+    return heuristic(html, text)
+
+
+def heuristic(html: str = "", text: str = "", warnings: Optional[List[str]] = None) -> InstagramFindings:
+    """Deterministic findings from whatever page text is available (may be none)."""
     mission_signals = []
     keywords = []
-    warnings = []
+    warnings = list(warnings or [])
     if "FETCH_ERROR" in html:
         warnings.append("Failed to fetch Instagram page.")
     if text:
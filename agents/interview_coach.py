@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-import json
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
-from ..schemas import ClubBrief, InterviewPrep, model_to_dict
-from .llm_utils import call_openai_json
+from ..schemas import ClubBrief, InterviewPrep
+from .llm_utils import acall_llm_json, call_llm_json, salvage_reply
+from .prompting import fit, model_json
+from .rate_limit import llm_priority
+from ..tracing import annotate
 
 
 SYSTEM_PROMPT = (
@@ -16,19 +18,24 @@ SYSTEM_PROMPT = (
 async def run(brief: ClubBrief) -> InterviewPrep:
     print("[InterviewCoachAgent] start generating prep")
     user_prompt = (
-        "ClubBrief:\n" + json.dumps(model_to_dict(brief), indent=2) + "\n\n"
+        "ClubBrief:\n" + model_json(brief) + "\n\n"
         + "Generate likely questions, short pitch template, and useful links."
     )
 
     print("[InterviewCoachAgent] calling LLM for interview prep...")
-    data = call_openai_json(SYSTEM_PROMPT, user_prompt)
+    data = await acall_llm_json(SYSTEM_PROMPT, user_prompt, schema=InterviewPrep)
     if data:
-        try:
-            return InterviewPrep(**data)
-        except Exception:
-            print("[InterviewCoachAgent] LLM JSON parse failed, using fallback")
+        result = salvage_reply("InterviewCoachAgent", InterviewPrep, data, lambda: heuristic(brief))
+        if result is not None:
+            return result
 
-    # Fallback
+    print("[InterviewCoachAgent] using heuristic fallback")
+    annotate(outcome="fallback")
+    return heuristic(brief)
+
+
+def heuristic(brief: ClubBrief) -> InterviewPrep:
+    """Generic interview prep; the same for every club."""
     likely_questions: List[str] = [
         "Walk me through a project relevant to our club.",
         "Why this club at this school?",
@@ -50,7 +57,6 @@ async def run(brief: ClubBrief) -> InterviewPrep:
         "How do teams choose projects and measure outcomes?",
         "What mentorship or training is available?",
     ]
-    print("[InterviewCoachAgent] using heuristic fallback")
     return InterviewPrep(
         similar_experiences_summary="Prepare 2–3 stories mapped to what_matters_most.",
         likely_questions=likely_questions,
@@ -68,7 +74,7 @@ class InterviewChat:
         self.brief = brief
         self.history = []  # list of (role, content)
 
-    def chat(self, user_input: str) -> str:
+    def _prompts(self, user_input: str) -> Tuple[str, str]:
         system = (
             f"You simulate a realistic interview for {self.club_name} at {self.school_name}. "
             "Keep responses succinct and probing."
@@ -76,12 +82,13 @@ class InterviewChat:
         # Build conversation
         conv = "\n".join([f"{r.upper()}: {c}" for r, c in self.history[-6:]])
         user_prompt = (
-            "ClubBrief:\n" + json.dumps(model_to_dict(self.brief), indent=2) + "\n\n"
-            + f"Conversation so far:\n{conv}\n\n"
+            "ClubBrief:\n" + model_json(self.brief) + "\n\n"
+            + f"Conversation so far:\n{fit('interview_chat', conv, keep_end=True)}\n\n"
             + f"User: {user_input}\nAssistant:"
         )
-        print("[InterviewChat] LLM chat turn")
-        data = call_openai_json(system, user_prompt)
+        return system, user_prompt
+
+    def _record(self, user_input: str, data: Optional[Dict[str, Any]]) -> str:
         if data is not None:
             # If the model returned JSON, flatten to text
             reply = str(data)
@@ -95,3 +102,19 @@ class InterviewChat:
         self.history.append(("user", user_input))
         self.history.append(("assistant", reply))
         return reply
+
+    async def achat(self, user_input: str) -> str:
+        system, user_prompt = self._prompts(user_input)
+        print("[InterviewChat] LLM chat turn")
+        # A user is waiting on this turn: jump the rate-limit queue
+        with llm_priority("interactive"):
+            data = await acall_llm_json(system, user_prompt, cache=False)
+        return self._record(user_input, data)
+
+    def chat(self, user_input: str) -> str:
+        """Blocking variant of :meth:`achat` for callers without an event loop."""
+        system, user_prompt = self._prompts(user_input)
+        print("[InterviewChat] LLM chat turn")
+        with llm_priority("interactive"):
+            data = call_llm_json(system, user_prompt, cache=False)
+        return self._record(user_input, data)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import io
+import json
+import re
+from typing import Any, List, NamedTuple, Optional
+
+
+class PartialEvent(NamedTuple):
+    """A piece of a JSON object that finished arriving.
+
+    ``index`` is None when ``value`` is the complete top-level ``field``, or the
+    position of ``value`` within the top-level list ``field``.
+    """
+
+    field: str
+    value: Any
+    index: Optional[int] = None
+
+
+def _loads(fragment: str) -> Any:
+    try:
+        return json.loads(fragment)
+    except Exception:
+        return json.loads(re.sub(r",\s*([}\]])", r"\1", fragment))
+
+
+class IncrementalJSONParser:
+    """Scan a JSON object as it streams in and report completed parts early.
+
+    Each top-level field is emitted as soon as its value closes, and each item
+    of a top-level list as soon as that item closes, without waiting for the
+    rest of the document. Text before the first ``{`` (e.g. a markdown fence)
+    and after the closing ``}`` is ignored.
+    """
+
+    def __init__(self) -> None:
+        # Everything fed so far; only new text is scanned, and completed
+        # fragments are read back by offset, so a reply costs O(n) overall
+        self._buf = io.StringIO()
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_str = False
+        self._esc = False
+        self._phase = "key"  # key -> value -> after (per top-level field)
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        return self._buf.getvalue()
+
+    def _slice(self, start: int, end: int) -> str:
+        self._buf.seek(start)
+        return self._buf.read(end - start)
+
+    def feed(self, chunk: str) -> List[PartialEvent]:
+        """Consume the next chunk of text; return the parts it completed."""
+        events: List[PartialEvent] = []
+        if self.done or not chunk:
+            return events
+        self._buf.seek(0, io.SEEK_END)
+        self._buf.write(chunk)
+        for offset, ch in enumerate(chunk):
+            self._step(ch, self._pos + offset, events)
+            if self.done:
+                break
+        self._pos += len(chunk)
+        return events
+
+    def _emit(self, events: List[PartialEvent], fragment: str, index: Optional[int] = None) -> None:
+        if self._key is None:
+            return
+        try:
+            events.append(PartialEvent(self._key, _loads(fragment.strip()), index))
+        except Exception:
+            pass
+
+    def _in_top_list(self) -> bool:
+        return len(self._stack) == 2 and self._stack[1] == "["
+
+    def _step(self, ch: str, i: int, events: List[PartialEvent]) -> None:
+        if not self._stack:
+            if ch == "{":
+                self._stack.append("{")
+            return
+        if self._in_str:
+            if self._esc:
+                self._esc = False
+            elif ch == "\\":
+                self._esc = True
+            elif ch == '"':
+                self._in_str = False
+                if len(self._stack) == 1 and self._phase == "key" and self._key_start is not None:
+                    self._key = _loads(self._slice(self._key_start, i + 1))
+                    self._key_start = None
+            return
+        if ch.isspace():
+            return
+
+        depth = len(self._stack)
+        if depth == 1 and self._phase == "value" and self._value_start is None:
+            self._value_start = i
+        if self._in_top_list() and self._item_start is None and ch not in "],":
+            self._item_start = i
+
+        if ch == '"':
+            self._in_str = True
+            if depth == 1 and self._phase == "key":
+                self._key_start = i
+        elif ch in "{[":
+            self._stack.append(ch)
+            if depth == 1:
+                self._item_start = None
+                self._item_index = 0
+        elif ch in "}]":
+            if self._in_top_list() and ch == "]" and self._item_start is not None:
+                # Scalar last item
+                self._emit(events, self._slice(self._item_start, i), self._item_index)
+                self._item_start = None
+            self._stack.pop()
+            depth = len(self._stack)
+            if depth == 0:
+                if self._phase == "value" and self._value_start is not None:
+                    self._emit(events, self._slice(self._value_start, i))
+                self.done = True
+            elif depth == 1:
+                self._emit(events, self._slice(self._value_start, i + 1))
+                self._phase = "after"
+            elif self._in_top_list() and self._item_start is not None:
+                self._emit(events, self._slice(self._item_start, i + 1), self._item_index)
+                self._item_start = None
+                self._item_index += 1
+        elif ch == ":" and depth == 1:
+            self._phase = "value"
+            self._value_start = None
+        elif ch == ",":
+            if depth == 1:
+                if self._phase == "value" and self._value_start is not None:
+                    self._emit(events, self._slice(self._value_start, i))
+                self._phase = "key"
+                self._key = None
+            elif self._in_top_list() and self._item_start is not None:
+                self._emit(events, self._slice(self._item_start, i), self._item_index)
+                self._item_start = None
+                self._item_index += 1
@@ -1,9 +1,36 @@
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import hashlib
 import json
 import os
 import re
-from typing import Optional, Any, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional, Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from ..cache import TieredCache, stable_hash
+from ..schemas import json_schema, salvage
+from ..singleflight import Group
+from ..tracing import span, annotate
+from .json_stream import IncrementalJSONParser, PartialEvent
+from .prompting import estimate_tokens
+from .rate_limit import current_priority, get_rate_limiter
+from .provider_health import (
+    BreakerOpen,
+    backoff_delay,
+    guarded_attempt,
+    health,
+    hedge_delay,
+    hedged,
+    hedging_enabled,
+)
+
+
+TEMPERATURE = 0.2
 
 
 def _clean_json(text: str) -> str:
@@ -31,117 +58,706 @@ def try_parse_json(text: str) -> Optional[Dict[str, Any]]:
             return None
 
 
-def _call_openai_json(system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+# ---------------------------------------------------------------------------
+# Provider client registry: one long-lived client per provider and config,
+# so connection pools (TLS sessions, keep-alive sockets) and resolved
+# credentials are reused across calls. A client is rebuilt only when its
+# credentials or settings change.
+# ---------------------------------------------------------------------------
+
+HTTP_POOL_SIZE = int(os.getenv("LLM_HTTP_POOL_SIZE", "32"))
+
+_clients: Dict[str, Tuple[str, Any]] = {}
+_clients_lock = threading.Lock()
+
+
+def _fingerprint(*parts: Optional[str]) -> str:
+    # Hash so raw secrets are never kept around as dict keys
+    return hashlib.sha256("\x00".join(p or "" for p in parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _registry_get(slot: str, fingerprint: str, factory: Callable[[], Any]) -> Any:
+    with _clients_lock:
+        entry = _clients.get(slot)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        print(f"[LLM] creating client {slot}")
+        client = factory()
+        _clients[slot] = (fingerprint, client)
+        return client
+
+
+def _bedrock_region() -> str:
+    return os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "us-east-1"
+
+
+def get_openai_client(api_key: str) -> Any:
+    from openai import OpenAI
+
+    base_url = os.getenv("OPENAI_BASE_URL")
+
+    def _make() -> Any:
+        try:
+            import httpx
+
+            http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=HTTP_POOL_SIZE,
+                    max_keepalive_connections=HTTP_POOL_SIZE,
+                    keepalive_expiry=60.0,
+                ),
+                timeout=httpx.Timeout(60.0, connect=10.0),
+            )
+        except Exception:
+            http_client = None
+        # Retries are handled by _with_retries so they respect the breakers
+        return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+
+    return _registry_get("openai", _fingerprint(api_key, base_url), _make)
+
+
+def get_gemini_model(api_key: str, model: str) -> Any:
+    import google.generativeai as genai
+
+    def _configure() -> Any:
+        # genai keeps its transport globally; reconfigure only on key change
+        genai.configure(api_key=api_key)
+        return genai
+
+    _registry_get("gemini", _fingerprint(api_key), _configure)
+    return _registry_get(f"gemini:{model}", _fingerprint(api_key, model), lambda: genai.GenerativeModel(model))
+
+
+def get_bedrock_client(region: Optional[str] = None) -> Any:
+    import boto3
+    from botocore.config import Config
+
+    region = region or _bedrock_region()
+
+    def _make() -> Any:
+        config = Config(
+            max_pool_connections=HTTP_POOL_SIZE,
+            tcp_keepalive=True,
+            # Retries/fallback across models are handled in _call_bedrock_json
+            retries={"max_attempts": 1, "mode": "standard"},
+        )
+        return boto3.session.Session().client("bedrock-runtime", region_name=region, config=config)
+
+    fp = _fingerprint(
+        region,
+        os.getenv("AWS_PROFILE"),
+        os.getenv("AWS_ACCESS_KEY_ID"),
+        os.getenv("AWS_SECRET_ACCESS_KEY"),
+        os.getenv("AWS_SESSION_TOKEN"),
+    )
+    return _registry_get(f"bedrock:{region}", fp, _make)
+
+
+def warm_clients() -> Optional[str]:
+    """Create the active provider's client ahead of the first request."""
+    provider = _resolve_provider()
+    try:
+        if provider == "openai":
+            get_openai_client(os.getenv("OPENAI_API_KEY") or "")
+        elif provider == "gemini":
+            key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY") or ""
+            get_gemini_model(key, os.getenv("GEMINI_MODEL", "gemini-1.5-flash"))
+        elif provider == "bedrock":
+            get_bedrock_client()
+    except Exception as e:
+        print(f"[LLM] client warm-up failed for {provider}: {e}")
+    return provider
+
+
+# ---------------------------------------------------------------------------
+# Streaming: providers stream their reply and completed JSON fields / list
+# items are handed to a partial-result callback while generation continues.
+# ---------------------------------------------------------------------------
+
+PartialCallback = Callable[[PartialEvent], None]
+
+_partial_handler: contextvars.ContextVar[Optional[PartialCallback]] = contextvars.ContextVar(
+    "clubapply_llm_partial", default=None
+)
+
+
+@contextmanager
+def stream_partials(handler: Optional[PartialCallback]) -> Iterator[None]:
+    """Stream every LLM call made in this context to ``handler``.
+
+    Lets a caller (e.g. the orchestrator) receive partial fields from agents
+    without threading a callback through each agent's signature.
+    """
+    token = _partial_handler.set(handler)
+    try:
+        yield
+    finally:
+        _partial_handler.reset(token)
+
+
+class _PartialSink:
+    """Feeds streamed reply text through an incremental parser to a callback.
+
+    Each attempt gets a fresh parser; events already delivered by an earlier
+    (failed) attempt are not repeated.
+    """
+
+    def __init__(self, on_partial: PartialCallback):
+        self.on_partial = on_partial
+        self._seen: Set[Tuple[str, Optional[int]]] = set()
+
+    def emit(self, event: PartialEvent) -> None:
+        key = (event.field, event.index)
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        try:
+            self.on_partial(event)
+        except Exception as e:
+            print(f"[LLM] partial callback failed: {e}")
+
+    def consume(self, chunks: Iterable[Optional[str]]) -> str:
+        parser = IncrementalJSONParser()
+        parts = []
+        for chunk in chunks:
+            if not chunk:
+                continue
+            parts.append(chunk)
+            for event in parser.feed(chunk):
+                self.emit(event)
+        return "".join(parts)
+
+    def replay(self, data: Dict[str, Any]) -> None:
+        # Cached/coalesced replies arrive whole: deliver them as complete fields
+        for field, value in data.items():
+            self.emit(PartialEvent(field, value))
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting: every attempt is admitted by the shared RPM/TPM limiter
+# (agents/rate_limit.py) before it is sent, so bursts queue locally instead
+# of being throttled by the provider.
+# ---------------------------------------------------------------------------
+
+# Prompt token estimate of the call in progress, charged against TPM quotas
+_prompt_tokens: contextvars.ContextVar[int] = contextvars.ContextVar("clubapply_llm_prompt_tokens", default=0)
+
+
+def _admit(provider: str, model: str) -> None:
+    limiter = get_rate_limiter()
+    # No point queueing for a target whose breaker will reject the attempt
+    if limiter is not None and health.available(provider, model):
+        limiter.acquire(provider, model, _prompt_tokens.get())
+
+
+class _UnusableResponse(ValueError):
+    """The provider answered, but with nothing we can parse as JSON."""
+
+
+class PartialReply(dict):
+    """Fields salvaged from a reply that was not valid JSON (usually cut off
+    at max_tokens). Usable, but never cached: a retry may get the full reply."""
+
+
+def _parse_reply(provider: str, text: Optional[str]) -> Dict[str, Any]:
+    if not text:
+        raise _UnusableResponse("empty_response")
+    print(f"[LLM] {provider} response chars={len(text)}")
+    annotate(response_chars=len(text))
+    parsed = try_parse_json(text)
+    if parsed is None:
+        parsed = _completed_fields(text)
+        if not parsed:
+            raise _UnusableResponse("json_parse_failed")
+        # Usually a reply cut off at max_tokens: keep the fields that closed
+        # rather than paying for another round trip
+        print(f"[LLM] {provider} reply was not valid JSON; salvaged fields: {', '.join(parsed)}")
+        annotate(salvaged_fields=list(parsed))
+        return PartialReply(parsed)
+    return parsed
+
+
+def _completed_fields(text: str) -> Dict[str, Any]:
+    parser = IncrementalJSONParser()
+    return {e.field: e.value for e in parser.feed(text) if e.index is None}
+
+
+def _with_retries(provider: str, model: str, request: Callable[[], Optional[str]]) -> Optional[Dict[str, Any]]:
+    """Call a single-model provider with jittered backoff between attempts.
+
+    Transport errors are retried up to LLM_MAX_ATTEMPTS (default 2) while the
+    model's breaker stays closed; an unusable reply is not retried.
+    """
+    attempts = max(1, int(os.getenv("LLM_MAX_ATTEMPTS", "2")))
+    for i in range(attempts):
+        annotate(attempts=i + 1)
+        try:
+            _admit(provider, model)
+            return _parse_reply(provider, guarded_attempt(provider, model, request))
+        except BreakerOpen as e:
+            print(f"[LLM] {e}; skipping call")
+            return None
+        except _UnusableResponse as e:
+            print(f"[LLM] {provider} unusable response ({e})")
+            return None
+        except Exception as e:
+            print(f"[LLM] {provider} call failed (attempt {i + 1}/{attempts}): {e}", flush=True)
+            if i + 1 < attempts:
+                time.sleep(backoff_delay(i))
+    return None
+
+
+def _call_openai_json(
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str] = None,
+    sink: Optional[_PartialSink] = None,
+    schema: Optional[type] = None,
+    max_tokens: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         return None
     try:
-        from openai import OpenAI
+        client = get_openai_client(api_key)
     except Exception:
         return None
     mdl = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     print(f"[LLM] OpenAI call model={mdl} sys_chars={len(system_prompt)} user_chars={len(user_prompt)}")
-    client = OpenAI(api_key=api_key)
-    try:
+    annotate(model=mdl)
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
+    extra: Dict[str, Any] = {}
+    if schema is not None:
+        # Structured outputs: the reply is constrained to the schema's JSON
+        extra["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": schema.__name__, "schema": json_schema(schema), "strict": False},
+        }
+    if max_tokens:
+        extra["max_tokens"] = max_tokens
+
+    def _request() -> Optional[str]:
+        if sink is not None:
+            stream = client.chat.completions.create(
+                model=mdl, messages=messages, temperature=TEMPERATURE, stream=True, **extra
+            )
+            return sink.consume(
+                chunk.choices[0].delta.content if chunk.choices else None for chunk in stream
+            )
         completion = client.chat.completions.create(
             model=mdl,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.2,
+            messages=messages,
+            temperature=TEMPERATURE,
+            **extra,
         )
-        content = completion.choices[0].message.content
-        if not content:
-            return None
-        print(f"[LLM] OpenAI response chars={len(content)}")
-        return try_parse_json(content)
+        return completion.choices[0].message.content
+
+    return _with_retries("openai", mdl, _request)
+
+
+def _gemini_text(resp: Any) -> Optional[str]:
+    try:
+        text = getattr(resp, "text", None)
+    except Exception:
+        # .text raises when the reply has several parts or was blocked
+        text = None
+    if text:
+        return text
+    try:
+        cand = resp.candidates[0]
+        parts = getattr(cand, "content", None).parts if hasattr(cand, "content") else []
+        return "\n".join(getattr(p, "text", "") for p in parts)
     except Exception:
-        print("[LLM] OpenAI call failed", flush=True)
         return None
 
 
-def _call_gemini_json(system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+def _call_gemini_json(
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str] = None,
+    sink: Optional[_PartialSink] = None,
+    schema: Optional[type] = None,
+    max_tokens: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
     key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
     if not key:
         return None
     try:
-        import google.generativeai as genai
+        import google.generativeai  # noqa: F401
     except Exception:
         return None
-    try:
-        genai.configure(api_key=key)
-        mdl = model or os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
-        print(f"[LLM] Gemini call model={mdl} sys_chars={len(system_prompt)} user_chars={len(user_prompt)}")
-        prompt = (
-            "System:\n" + system_prompt + "\n\n" +
-            "User:\n" + user_prompt + "\n\n" +
-            "Return ONLY valid JSON."
-        )
-        m = genai.GenerativeModel(mdl)
-        resp = m.generate_content(prompt)
-        text = getattr(resp, "text", None)
-        if text:
-            print(f"[LLM] Gemini response chars={len(text)}")
-            return try_parse_json(text)
-        try:
-            cand = resp.candidates[0]
-            parts = getattr(cand, "content", None).parts if hasattr(cand, "content") else []
-            combined = "\n".join(getattr(p, "text", "") for p in parts)
-            print(f"[LLM] Gemini response (combined parts) chars={len(combined)}")
-            return try_parse_json(combined)
-        except Exception:
-            return None
-    except Exception:
-        print("[LLM] Gemini call failed", flush=True)
-        return None
+    mdl = model or os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    print(f"[LLM] Gemini call model={mdl} sys_chars={len(system_prompt)} user_chars={len(user_prompt)}")
+    annotate(model=mdl)
+    prompt = (
+        "System:\n" + system_prompt + "\n\n" +
+        "User:\n" + user_prompt + "\n\n" +
+        "Return ONLY valid JSON."
+    )
+    config: Dict[str, Any] = {}
+    if schema is not None:
+        # JSON mode; the field list is in the prompt since Gemini's
+        # response_schema accepts only a subset of JSON Schema
+        config["generation_config"] = {"response_mime_type": "application/json"}
+        prompt += "\nJSON Schema:\n" + json.dumps(json_schema(schema), separators=(",", ":"))
+    if max_tokens:
+        config.setdefault("generation_config", {})["max_output_tokens"] = max_tokens
+
+    def _request() -> Optional[str]:
+        m = get_gemini_model(key, mdl)
+        if sink is not None:
+            return sink.consume(_gemini_text(chunk) for chunk in m.generate_content(prompt, stream=True, **config))
+        return _gemini_text(m.generate_content(prompt, **config))
+
+    return _with_retries("gemini", mdl, _request)
+
 
+# Providers added at runtime, e.g. the offline benchmark's fake LLM
+ProviderRequest = Callable[..., Iterable[str]]
+_custom_providers: Dict[str, Callable[..., Optional[Dict[str, Any]]]] = {}
 
-def call_llm_json(system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+
+def register_provider(name: str, request: ProviderRequest, default_model: str = "default") -> None:
+    """Make ``request`` selectable with LLM_PROVIDER=<name>.
+
+    ``request(system_prompt, user_prompt, model=..., schema=None)`` sends one
+    attempt and returns the reply text, as a string or an iterable of chunks.
+    Exceptions are retried with backoff and feed the model's circuit breaker,
+    and chunks are streamed to partial-result callbacks, as for the built-in
+    providers.
+    """
+    def call(
+        system_prompt: str,
+        user_prompt: str,
+        model: Optional[str] = None,
+        sink: Optional[_PartialSink] = None,
+        schema: Optional[type] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        mdl = model or default_model
+
+        def _request() -> str:
+            chunks = request(system_prompt, user_prompt, model=mdl, schema=schema)
+            if isinstance(chunks, str):
+                chunks = [chunks]
+            return sink.consume(chunks) if sink is not None else "".join(chunks)
+
+        return _with_retries(name, mdl, _request)
+
+    _custom_providers[name.lower()] = call
+
+
+def _resolve_provider() -> Optional[str]:
     provider = (os.getenv("LLM_PROVIDER") or "").lower().strip()
+    if provider in _custom_providers:
+        return provider
     if provider in {"gemini", "google"}:
         print("[LLM] Provider forced: gemini")
-        return _call_gemini_json(system_prompt, user_prompt, model=model)
+        return "gemini"
     if provider in {"bedrock", "aws"}:
         print("[LLM] Provider forced: bedrock")
-        return _call_bedrock_json(system_prompt, user_prompt, model=model)
+        return "bedrock"
     if os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY"):
         print("[LLM] Provider auto: gemini (key present)")
-        return _call_gemini_json(system_prompt, user_prompt, model=model)
+        return "gemini"
     if os.getenv("OPENAI_API_KEY"):
         print("[LLM] Provider auto: openai (key present)")
-        return _call_openai_json(system_prompt, user_prompt, model=model)
+        return "openai"
     # Try AWS Bedrock via default credential chain
     if os.getenv("AWS_ACCESS_KEY_ID") or os.getenv("AWS_PROFILE"):
         print("[LLM] Provider auto: bedrock (aws creds present)")
-        return _call_bedrock_json(system_prompt, user_prompt, model=model)
-    print("[LLM] No provider available; returning None")
+        return "bedrock"
     return None
 
 
+# ---------------------------------------------------------------------------
+# Response cache: identical (provider, model, temperature, prompts) requests
+# are answered from a memory LRU backed by a local SQLite store.
+# ---------------------------------------------------------------------------
+
+_response_cache: Optional[TieredCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[TieredCache]:
+    """Shared LLM response cache; disabled with LLM_CACHE=0."""
+    global _response_cache
+    if os.getenv("LLM_CACHE", "1").lower() in {"0", "false", "no", "off"}:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = TieredCache(
+                "llm_responses",
+                default_ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+                memory_entries=int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "512")),
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+            )
+    return _response_cache
+
+
+_llm_flight = Group("llm")
+
+
+def _copy_json(data: Any) -> Any:
+    copy = json.loads(json.dumps(data))
+    return PartialReply(copy) if isinstance(data, PartialReply) else copy
+
+
+def _cacheable(data: Dict[str, Any], schema: Optional[type]) -> bool:
+    if isinstance(data, PartialReply):
+        return False
+    if schema is None:
+        return True
+    try:
+        schema(**data)
+    except Exception as e:
+        print(f"[LLM] reply does not match {schema.__name__}; not caching ({type(e).__name__})")
+        return False
+    return True
+
+
+def _effective_model(provider: str, model: Optional[str]) -> str:
+    if model:
+        return model
+    if provider == "openai":
+        return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    if provider == "gemini":
+        return os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+    # Bedrock walks a candidate list; key on the configured primary
+    return os.getenv("BEDROCK_MODEL_ID") or "auto"
+
+
+def _response_key(
+    provider: str,
+    model: Optional[str],
+    system_prompt: str,
+    user_prompt: str,
+    schema: Optional[type] = None,
+    max_tokens: Optional[int] = None,
+) -> str:
+    prompt_hash = hashlib.sha256((system_prompt + "\x00" + user_prompt).encode("utf-8")).hexdigest()
+    material: List[Any] = [provider, _effective_model(provider, model), TEMPERATURE, prompt_hash]
+    if schema is not None:
+        material.append(stable_hash(json_schema(schema)))
+    if max_tokens:
+        material.append(max_tokens)
+    return stable_hash(material)
+
+
+def call_llm_json(
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str] = None,
+    cache: bool = True,
+    on_partial: Optional[PartialCallback] = None,
+    schema: Optional[type] = None,
+    max_tokens: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """Route to the configured provider and return the parsed JSON reply.
+
+    ``schema`` is the pydantic model the reply should match; it switches the
+    provider to its native structured-output mode (OpenAI json_schema
+    response_format, Gemini JSON mime type, Bedrock forced tool use). The
+    reply is still returned as a dict for the caller to validate.
+    ``max_tokens`` raises (or lowers) the reply cap for requests whose output
+    is larger than one agent's, e.g. the fused coaching call.
+
+    Replies are served from / stored in the response cache, and identical
+    concurrent requests are coalesced into one provider call, unless
+    ``cache`` is False (e.g. conversational turns). Failed calls are never
+    cached.
+
+    With ``on_partial`` (or a handler installed via :func:`stream_partials`)
+    the reply is streamed and each top-level field, and each item of a
+    top-level list, is passed to the callback as soon as it is complete.
+    Cached and coalesced replies are delivered as whole fields.
+    """
+    on_partial = on_partial or _partial_handler.get()
+    sink = _PartialSink(on_partial) if on_partial is not None else None
+    provider = _resolve_provider()
+    with span(
+        "llm",
+        provider=provider or "none",
+        prompt_chars=len(system_prompt) + len(user_prompt),
+    ) as attrs:
+        if provider is None:
+            print("[LLM] No provider available; returning None")
+            attrs["outcome"] = "unavailable"
+            return None
+        attrs["prompt_tokens"] = estimate_tokens(
+            system_prompt + "\n" + user_prompt, _effective_model(provider, model)
+        )
+        store = get_response_cache() if cache else None
+        key = _response_key(provider, model, system_prompt, user_prompt, schema, max_tokens)
+        if store is not None:
+            hit = store.get(key)
+            if hit is not None:
+                print(f"[LLM] response cache hit provider={provider}")
+                attrs["outcome"] = "cache_hit"
+                # Callers mutate the dict they get back; never hand out the cached object
+                data = _copy_json(hit)
+                if sink is not None:
+                    sink.replay(data)
+                return data
+        call = {
+            "gemini": _call_gemini_json,
+            "openai": _call_openai_json,
+            "bedrock": _call_bedrock_json,
+            **_custom_providers,
+        }[provider]
+
+        if sink is not None:
+            attrs["streamed"] = True
+
+        def _run() -> Optional[Dict[str, Any]]:
+            token = _prompt_tokens.set(attrs["prompt_tokens"])
+            try:
+                data = call(system_prompt, user_prompt, model=model, sink=sink, schema=schema, max_tokens=max_tokens)
+            finally:
+                _prompt_tokens.reset(token)
+            # Only replies the caller can use as is: a schema-invalid one would
+            # replay as a heuristic fallback for the whole TTL
+            if data is not None and store is not None and _cacheable(data, schema):
+                store.set(key, _copy_json(data))
+            return data
+
+        if cache:
+            # Identical requests already in flight share that one round trip
+            data = _llm_flight.do(key, _run, copy=_copy_json)
+            if data is not None and sink is not None:
+                # Followers of a coalesced call saw no stream; already-sent fields are skipped
+                sink.replay(data)
+        else:
+            data = _run()
+        if data is None:
+            attrs["outcome"] = "failed"
+        return data
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_interactive_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _llm_executor() -> ThreadPoolExecutor:
+    """Bounded pool the blocking provider SDKs run on (LLM_MAX_CONCURRENCY, default 16).
+
+    Interactive calls get a small pool of their own, so pipeline calls queued
+    behind the rate limiter cannot hold every thread while a user waits.
+    """
+    global _executor, _interactive_executor
+    with _executor_lock:
+        if current_priority() == "interactive":
+            if _interactive_executor is None:
+                _interactive_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-interactive")
+            return _interactive_executor
+        if _executor is None:
+            workers = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="llm")
+    return _executor
+
+
+async def acall_llm_json(
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str] = None,
+    cache: bool = True,
+    on_partial: Optional[Callable[[PartialEvent], Any]] = None,
+    schema: Optional[type] = None,
+    max_tokens: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
+    """Async call_llm_json: the provider round trip runs on the bounded LLM pool.
+
+    The event loop stays free while a request is in flight, so concurrent
+    agents and HTTP requests overlap their LLM latency instead of queueing.
+    The caller's context (e.g. the active tracing span) carries over.
+    ``on_partial`` may be a coroutine function; it is scheduled on this loop.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    handler: Optional[PartialCallback] = on_partial
+    if on_partial is not None and asyncio.iscoroutinefunction(on_partial):
+        def handler(event: PartialEvent) -> None:
+            loop.call_soon_threadsafe(lambda: asyncio.ensure_future(on_partial(event)))
+    return await loop.run_in_executor(
+        _llm_executor(), ctx.run, call_llm_json, system_prompt, user_prompt, model, cache, handler, schema, max_tokens
+    )
+
+
+def salvage_reply(tag: str, model_cls: type, data: Dict[str, Any], fallback: Callable[[], Any]) -> Optional[Any]:
+    """Validate an LLM reply, filling only the invalid fields from ``fallback``.
+
+    Returns None if the reply cannot be used at all. A partly heuristic result,
+    or one built from a :class:`PartialReply`, marks the span ``salvaged`` so
+    it is not stored in the stage cache.
+    """
+    try:
+        result, replaced = salvage(model_cls, data, fallback)
+    except Exception:
+        print(f"[{tag}] LLM JSON parse failed, using fallback")
+        return None
+    if replaced:
+        print(f"[{tag}] filled invalid fields from fallback: {', '.join(replaced)}")
+        annotate(outcome="salvaged", salvaged_fields=replaced)
+    elif isinstance(data, PartialReply):
+        annotate(outcome="salvaged", salvaged_fields=list(data))
+    return result
+
+
 # Backward compatibility for existing imports
 def call_openai_json(system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
     return call_llm_json(system_prompt, user_prompt, model=model)
 
 
-def _call_bedrock_json(system_prompt: str, user_prompt: str, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+def default_max_tokens() -> int:
+    """Reply cap for one agent's output (BEDROCK_MAX_TOKENS, default 1024).
+
+    Bedrock always sends it; the other providers only get a cap when a
+    caller passes ``max_tokens`` explicitly.
+    """
+    return int(os.getenv("BEDROCK_MAX_TOKENS", "1024"))
+
+
+def _bedrock_stream_text(response: Any) -> Iterator[str]:
+    """Text deltas from an invoke_model_with_response_stream event stream."""
+    for event in response.get("body") or []:
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        data = json.loads(chunk["bytes"].decode("utf-8"))
+        if data.get("type") == "content_block_delta":
+            delta = data.get("delta") or {}
+            # text_delta for plain replies, input_json_delta for tool use
+            text = delta.get("text") or delta.get("partial_json")
+            if text:
+                yield text
+
+
+def _call_bedrock_json(
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str] = None,
+    sink: Optional[_PartialSink] = None,
+    schema: Optional[type] = None,
+    max_tokens: Optional[int] = None,
+) -> Optional[Dict[str, Any]]:
     """Call AWS Bedrock (Anthropic Claude) and return parsed JSON.
 
     Tries a sequence of candidate model IDs to handle throttling or unavailability.
     Requires AWS credentials (env, profile, or instance role) and region.
     """
     try:
-        import boto3
+        import boto3  # noqa: F401
         from botocore.exceptions import ClientError
     except Exception:
         print("[LLM] boto3 not installed for Bedrock")
         return None
 
-    region = (
-        os.getenv("AWS_REGION")
-        or os.getenv("AWS_DEFAULT_REGION")
-        or "us-east-1"
-    )
+    region = _bedrock_region()
 
     # Build list of candidate models: env override > passed model > defaults
     env_primary = os.getenv("BEDROCK_MODEL_ID")
@@ -161,63 +777,111 @@ def _call_bedrock_json(system_prompt: str, user_prompt: str, model: Optional[str
 
     anthropic_version = os.getenv("ANTHROPIC_VERSION", "bedrock-2023-05-31")
 
-    client = boto3.client("bedrock-runtime", region_name=region)
+    try:
+        client = get_bedrock_client(region)
+    except Exception as e:
+        print(f"[LLM] Bedrock client init failed: {e}")
+        return None
 
-    last_err = None
-    for idx, model_id in enumerate(candidates, start=1):
-        print(f"[LLM] Bedrock attempt {idx}/{len(candidates)} model={model_id} region={region} sys_chars={len(system_prompt)} user_chars={len(user_prompt)}")
-        try:
-            body = {
-                "anthropic_version": anthropic_version,
-                "system": system_prompt + "\nReturn ONLY valid JSON.",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": user_prompt}
-                        ],
-                    }
+    request_body: Dict[str, Any] = {
+        "anthropic_version": anthropic_version,
+        "system": system_prompt + "\nReturn ONLY valid JSON.",
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": user_prompt}
                 ],
-                "max_tokens": 1024,
-                "temperature": 0.2,
             }
-            response = client.invoke_model(
+        ],
+        "max_tokens": max_tokens or default_max_tokens(),
+        "temperature": TEMPERATURE,
+    }
+    if schema is not None:
+        # Forced tool use: the model returns the object as the tool's input,
+        # already structured, instead of free text that may not parse
+        tool = f"emit_{schema.__name__}"
+        request_body["tools"] = [
+            {"name": tool, "description": f"Return the {schema.__name__}.", "input_schema": json_schema(schema)}
+        ]
+        request_body["tool_choice"] = {"type": "tool", "name": tool}
+    body = json.dumps(request_body)
+
+    def _request(model_id: str) -> Optional[str]:
+        if sink is not None:
+            response = client.invoke_model_with_response_stream(
                 modelId=model_id,
                 contentType="application/json",
                 accept="application/json",
-                body=json.dumps(body),
+                body=body,
             )
-            raw = response.get("body")
-            text_content = None
-            if raw is not None:
-                data = json.loads(raw.read().decode("utf-8"))
-                parts = []
-                for item in data.get("content", []) or []:
-                    t = item.get("text")
-                    if t:
-                        parts.append(t)
-                text_content = "\n".join(parts)
-            if not text_content:
-                print("[LLM] Bedrock empty response content; trying next model")
-                last_err = "empty_response"
-                continue
-            print(f"[LLM] Bedrock response chars={len(text_content)}")
-            parsed = try_parse_json(text_content)
-            if parsed is not None:
-                return parsed
-            print("[LLM] Bedrock JSON parse failed; trying next model")
-            last_err = "json_parse_failed"
+            return sink.consume(_bedrock_stream_text(response))
+        response = client.invoke_model(
+            modelId=model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=body,
+        )
+        raw = response.get("body")
+        if raw is None:
+            return None
+        data = json.loads(raw.read().decode("utf-8"))
+        parts = []
+        for item in data.get("content", []) or []:
+            if item.get("type") == "tool_use":
+                return json.dumps(item.get("input") or {})
+            t = item.get("text")
+            if t:
+                parts.append(t)
+        return "\n".join(parts)
+
+    def _attempt(model_id: str, admit: bool = True) -> Callable[[], Dict[str, Any]]:
+        def _run() -> Dict[str, Any]:
+            annotate(model=model_id)
+            if admit:
+                _admit("bedrock", model_id)
+            text = guarded_attempt("bedrock", model_id, lambda: _request(model_id))
+            return _parse_reply("bedrock", text)
+        return _run
+
+    # Skip models whose breaker is open (recently throttled or failing)
+    allowed = health.order("bedrock", candidates)
+    if not allowed:
+        print("[LLM] Bedrock: every candidate's breaker is open")
+        return None
+
+    last_err = None
+    remaining = list(allowed)
+    # Two racing streams would interleave partial results, so streamed calls
+    # are not hedged (they already surface output as it is generated).
+    if sink is None and hedging_enabled() and len(remaining) >= 2:
+        delay = hedge_delay("bedrock", remaining[0])
+        if delay is not None:
+            primary, backup = remaining[0], remaining[1]
+            remaining = remaining[2:]
+            print(f"[LLM] Bedrock hedged attempt model={primary} backup={backup} after={delay:.2f}s")
+            annotate(hedged=True)
+            try:
+                # Queueing in the rate limiter must not count towards the hedge delay
+                _admit("bedrock", primary)
+                return hedged("bedrock", (primary, _attempt(primary, admit=False)), (backup, _attempt(backup)), delay)
+            except Exception as e:
+                print(f"[LLM] Bedrock hedged pair failed: {e}; trying next model")
+                last_err = str(e)
+
+    for idx, model_id in enumerate(remaining, start=1):
+        print(f"[LLM] Bedrock attempt {idx}/{len(remaining)} model={model_id} region={region} sys_chars={len(system_prompt)} user_chars={len(user_prompt)}")
+        annotate(attempts=idx)
+        try:
+            return _attempt(model_id)()
         except ClientError as e:
             code = e.response.get("Error", {}).get("Code")
             msg = e.response.get("Error", {}).get("Message")
             print(f"[LLM] Bedrock ClientError code={code} msg={msg}; trying next model")
             last_err = code or str(e)
-            # On throttling or other errors, just try next candidate
-            continue
         except Exception as e:
-            print(f"[LLM] Bedrock call failed: {e}; trying next model")
+            print(f"[LLM] Bedrock attempt failed: {e}; trying next model")
             last_err = str(e)
-            continue
 
     print(f"[LLM] Bedrock exhausted candidates; last_err={last_err}")
     return None
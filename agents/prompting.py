@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from ..schemas import model_to_dict
+
+try:
+    import tiktoken  # type: ignore
+except Exception:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+
+# Fallback estimate when tiktoken is unavailable. English prose and JSON land
+# close to 4 characters per token on current BPE vocabularies; non-ASCII
+# characters usually cost a token or more each, so they are counted apart.
+CHARS_PER_TOKEN = float(os.getenv("PROMPT_CHARS_PER_TOKEN", "4.0"))
+
+# Token budget for the variable content each agent puts in its prompt
+# (scraped text, resume text). Override with PROMPT_BUDGET_<AGENT>.
+AGENT_BUDGETS: Dict[str, int] = {
+    "instagram": 1500,
+    "website": 2000,
+    "resume": 2000,
+    "interview_chat": 1200,
+}
+DEFAULT_AGENT_BUDGET = 1500
+
+# Per-model ceilings on the same budgets, matched by model-name prefix, for
+# models that are slower or pricier per input token. Override or extend with
+# PROMPT_MODEL_BUDGETS="model-prefix=tokens,...".
+MODEL_BUDGETS: Dict[str, int] = {
+    "gemini-1.5-pro": 1500,
+    "gpt-4o-2": 1500,
+    "anthropic.claude-3-opus": 1500,
+}
+
+TRUNCATION_MARKER = "\n[...truncated]"
+HEAD_MARKER = "[...earlier content truncated]\n"
+
+
+# ---------------------------------------------------------------------------
+# Token counting
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=8)
+def _encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model or "")
+    except Exception:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
+
+def estimate_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count of ``text``: exact with tiktoken, calibrated estimate otherwise."""
+    if not text:
+        return 0
+    enc = _encoding(model)
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return math.ceil((len(text) - non_ascii) / CHARS_PER_TOKEN) + non_ascii
+
+
+# ---------------------------------------------------------------------------
+# Budgets
+# ---------------------------------------------------------------------------
+
+def _model_budgets() -> Dict[str, int]:
+    budgets = dict(MODEL_BUDGETS)
+    for item in (os.getenv("PROMPT_MODEL_BUDGETS") or "").split(","):
+        prefix, _, value = item.partition("=")
+        if prefix.strip() and value.strip().isdigit():
+            budgets[prefix.strip()] = int(value)
+    return budgets
+
+
+def current_model() -> Optional[str]:
+    """Model the next call_llm_json would use by default, if any provider is configured."""
+    from .llm_utils import _effective_model, _resolve_provider
+
+    provider = _resolve_provider()
+    return _effective_model(provider, None) if provider else None
+
+
+def budget(agent: str, model: Optional[str] = None) -> int:
+    """Content token budget for ``agent``, capped by the model's ceiling if it has one."""
+    env = os.getenv(f"PROMPT_BUDGET_{agent.upper()}")
+    tokens = int(env) if env and env.isdigit() else AGENT_BUDGETS.get(agent, DEFAULT_AGENT_BUDGET)
+    model = model or current_model()
+    if model:
+        # Longest matching prefix wins
+        for prefix, cap in sorted(_model_budgets().items(), key=lambda kv: -len(kv[0])):
+            if model.startswith(prefix):
+                tokens = min(tokens, cap)
+                break
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Truncation
+# ---------------------------------------------------------------------------
+
+_SENTENCE_END = re.compile(r"[.!?](?=\s)|\n")
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None, keep_end: bool = False) -> str:
+    """Cut ``text`` to at most ``max_tokens``, preferring a clean boundary.
+
+    The cut falls back from a section break (blank line) to a sentence end to
+    a word boundary, whichever keeps at least ~80% of the allowed content.
+    With ``keep_end`` the most recent content (the tail) is kept instead.
+    """
+    if not text or estimate_tokens(text, model) <= max_tokens:
+        return text
+    if keep_end:
+        return _truncate_head(text, max_tokens, model)
+    room = max(0, max_tokens - estimate_tokens(TRUNCATION_MARKER, model))
+    # Start from a character estimate, then shrink until the count fits
+    end = min(len(text), int(room * CHARS_PER_TOKEN))
+    while end > 0 and estimate_tokens(text[:end], model) > room:
+        end = int(end * 0.9)
+    head = text[:end]
+    floor = int(len(head) * 0.8)
+
+    cut = head.rfind("\n\n")
+    if cut < floor:
+        ends = [m.end() for m in _SENTENCE_END.finditer(head)]
+        cut = ends[-1] if ends else -1
+    if cut < floor:
+        cut = head.rfind(" ")
+    if cut < floor:
+        cut = len(head)
+    return head[:cut].rstrip() + TRUNCATION_MARKER
+
+
+def _truncate_head(text: str, max_tokens: int, model: Optional[str]) -> str:
+    room = max(0, max_tokens - estimate_tokens(HEAD_MARKER, model))
+    start = max(0, len(text) - int(room * CHARS_PER_TOKEN))
+    while start < len(text) and estimate_tokens(text[start:], model) > room:
+        start += max(1, (len(text) - start) // 10)
+    tail = text[start:]
+    # Start on a line (turn / section) boundary when one is close enough
+    cut = tail.find("\n")
+    if cut == -1 or cut > len(tail) * 0.2:
+        cut = tail.find(" ")
+    return HEAD_MARKER + (tail[cut + 1 :] if 0 <= cut <= len(tail) * 0.2 else tail).lstrip()
+
+
+def fit(agent: str, text: str, model: Optional[str] = None, keep_end: bool = False) -> str:
+    """Truncate ``text`` to the agent's token budget."""
+    model = model or current_model()
+    return truncate_to_tokens(text, budget(agent, model), model, keep_end=keep_end)
+
+
+# ---------------------------------------------------------------------------
+# Compact serialization
+# ---------------------------------------------------------------------------
+
+def _prune(value: Any) -> Any:
+    # Empty fields carry no signal for the model; drop them to save tokens
+    if isinstance(value, dict):
+        pruned = {k: _prune(v) for k, v in value.items()}
+        return {k: v for k, v in pruned.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_prune(v) for v in value if v not in (None, "", [], {})]
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """Whitespace-free JSON of a model or plain value, without empty fields."""
+    if not isinstance(value, (dict, list, str, int, float, bool)) and value is not None:
+        value = model_to_dict(value)
+    return json.dumps(_prune(value), separators=(",", ":"), ensure_ascii=False)
+
+
+_serialized: OrderedDict[int, Tuple[Any, str]] = OrderedDict()
+_serialized_lock = threading.Lock()
+
+
+def model_json(model: Any) -> str:
+    """compact_json for a model object, computed once per instance.
+
+    Briefs are shared by every coaching agent and are not mutated once built,
+    so their serialization is memoized by identity (holding a reference keeps
+    the id from being reused).
+    """
+    key = id(model)
+    with _serialized_lock:
+        hit = _serialized.get(key)
+        if hit is not None and hit[0] is model:
+            _serialized.move_to_end(key)
+            return hit[1]
+    text = compact_json(model)
+    with _serialized_lock:
+        _serialized[key] = (model, text)
+        while len(_serialized) > 64:
+            _serialized.popitem(last=False)
+    return text
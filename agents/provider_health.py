@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import contextvars
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from ..tracing import counter, gauge
+
+
+# A target trips after this many consecutive failures (throttling trips at once)
+FAILURE_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "3"))
+BREAKER_BASE_SECONDS = float(os.getenv("LLM_BREAKER_BASE_SECONDS", "2"))
+BREAKER_MAX_SECONDS = float(os.getenv("LLM_BREAKER_MAX_SECONDS", "120"))
+WINDOW = 50
+# Latency percentiles need a few successful samples before they mean anything
+MIN_LATENCY_SAMPLES = 5
+# Never hedge sooner than this, whatever the observed p95
+HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_SECONDS", "0.5"))
+# Candidates failing at least this share of recent requests are tried after
+# healthier ones (once they have MIN_ERROR_SAMPLES outcomes)
+DEMOTE_ERROR_RATE = float(os.getenv("LLM_DEMOTE_ERROR_RATE", "0.5"))
+MIN_ERROR_SAMPLES = 10
+
+_trips = counter("clubapply_llm_breaker_trips_total", "Circuit breaker trips by provider and model.")
+_hedges = counter("clubapply_llm_hedges_total", "Hedged LLM requests by provider and winning side.")
+
+
+def is_throttle(err: Any) -> bool:
+    text = f"{type(err).__name__} {err}".lower()
+    return any(k in text for k in ("throttl", "too many requests", "429", "rate limit", "ratelimit", "resource_exhausted"))
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (0-based)."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TargetHealth:
+    """Rolling stats and circuit-breaker state for one provider/model pair."""
+
+    def __init__(self) -> None:
+        self.samples: Deque[Tuple[bool, float]] = deque(maxlen=WINDOW)
+        self.consecutive_failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.probing = False
+
+    def state(self, now: float) -> str:
+        if self.open_until == 0.0:
+            return "closed"
+        return "open" if now < self.open_until else "half_open"
+
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for ok, _ in self.samples if not ok) / len(self.samples)
+
+    def degraded(self) -> bool:
+        return len(self.samples) >= MIN_ERROR_SAMPLES and self.error_rate() >= DEMOTE_ERROR_RATE
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        lat = sorted(l for ok, l in self.samples if ok)
+        if len(lat) < MIN_LATENCY_SAMPLES:
+            return None
+        return lat[min(len(lat) - 1, int(q * len(lat)))]
+
+
+class HealthRegistry:
+    """Process-wide provider/model health used to route and hedge LLM calls."""
+
+    def __init__(self) -> None:
+        self._targets: Dict[Tuple[str, str], TargetHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, provider: str, model: str) -> TargetHealth:
+        key = (provider, model)
+        t = self._targets.get(key)
+        if t is None:
+            t = self._targets[key] = TargetHealth()
+        return t
+
+    def allow(self, provider: str, model: str) -> bool:
+        """True if a request may go to this target now.
+
+        An open breaker rejects everything until its backoff expires; after
+        that a single probe is let through (half-open) and its outcome decides
+        whether the breaker closes or re-opens with a longer backoff.
+        """
+        now = time.time()
+        with self._lock:
+            t = self._get(provider, model)
+            st = t.state(now)
+            if st == "closed":
+                return True
+            if st == "half_open" and not t.probing:
+                t.probing = True
+                return True
+            return False
+
+    def available(self, provider: str, model: str) -> bool:
+        """Like :meth:`allow` but without claiming the half-open probe."""
+        now = time.time()
+        with self._lock:
+            t = self._get(provider, model)
+            st = t.state(now)
+            return st == "closed" or (st == "half_open" and not t.probing)
+
+    def order(self, provider: str, models: List[str]) -> List[str]:
+        """Candidates whose breakers currently admit a request, in preference order.
+
+        Models with a high rolling error rate keep their place among
+        themselves but move behind the healthy ones.
+        """
+        allowed = [m for m in models if self.available(provider, m)]
+        skipped = [m for m in models if m not in allowed]
+        if skipped:
+            print(f"[LLM] {provider} breaker open, skipping: {', '.join(skipped)}")
+        with self._lock:
+            demoted = [m for m in allowed if self._get(provider, m).degraded()]
+        if demoted and len(demoted) < len(allowed):
+            print(f"[LLM] {provider} high error rate, trying last: {', '.join(demoted)}")
+            allowed = [m for m in allowed if m not in demoted] + demoted
+        return allowed
+
+    def record_success(self, provider: str, model: str, latency: float) -> None:
+        with self._lock:
+            t = self._get(provider, model)
+            t.samples.append((True, latency))
+            t.consecutive_failures = 0
+            t.trips = 0
+            t.open_until = 0.0
+            t.probing = False
+
+    def record_failure(self, provider: str, model: str, latency: float, throttled: bool = False) -> None:
+        with self._lock:
+            t = self._get(provider, model)
+            t.samples.append((False, latency))
+            t.consecutive_failures += 1
+            t.probing = False
+            if throttled or t.consecutive_failures >= FAILURE_THRESHOLD:
+                t.trips += 1
+                delay = min(BREAKER_MAX_SECONDS, BREAKER_BASE_SECONDS * (2 ** (t.trips - 1)))
+                delay *= random.uniform(0.5, 1.5)
+                t.open_until = time.time() + delay
+                print(f"[LLM] breaker open for {provider}:{model} for {delay:.1f}s (trips={t.trips})")
+                _trips.inc({"provider": provider, "model": model})
+
+    def p95(self, provider: str, model: str) -> Optional[float]:
+        with self._lock:
+            return self._get(provider, model).latency_percentile(0.95)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            return {
+                f"{p}:{m}": {
+                    "state": t.state(now),
+                    "error_rate": round(t.error_rate(), 3),
+                    "p50": t.latency_percentile(0.5),
+                    "p95": t.latency_percentile(0.95),
+                    "samples": len(t.samples),
+                    "open_for": max(0.0, round(t.open_until - now, 1)),
+                }
+                for (p, m), t in self._targets.items()
+            }
+
+
+health = HealthRegistry()
+
+_STATE_VALUES = {"closed": 0.0, "half_open": 1.0, "open": 2.0}
+
+
+def _health_gauge(field: str) -> Callable[[], List[Tuple[Dict[str, str], float]]]:
+    def collect() -> List[Tuple[Dict[str, str], float]]:
+        values = []
+        for target, stats in health.snapshot().items():
+            provider, _, model = target.partition(":")
+            value = stats[field]
+            if field == "state":
+                value = _STATE_VALUES[value]
+            if value is not None:
+                values.append(({"provider": provider, "model": model}, float(value)))
+        return values
+    return collect
+
+
+gauge("clubapply_llm_breaker_state", "Breaker state by provider and model (0 closed, 1 half-open, 2 open).", _health_gauge("state"))
+gauge("clubapply_llm_error_rate", "Share of failed requests in the rolling window.", _health_gauge("error_rate"))
+gauge("clubapply_llm_latency_p95_seconds", "Rolling p95 latency of successful requests.", _health_gauge("p95"))
+
+
+class BreakerOpen(RuntimeError):
+    """Raised instead of sending a request to a target whose breaker is open."""
+
+
+def guarded_attempt(provider: str, model: str, fn: Callable[[], Any]) -> Any:
+    """Run one request against a target if its breaker admits it.
+
+    The outcome and latency feed the target's health; throttling errors trip
+    the breaker immediately.
+    """
+    if not health.allow(provider, model):
+        raise BreakerOpen(f"{provider}:{model} circuit open")
+    start = time.perf_counter()
+    try:
+        result = fn()
+    except Exception as e:
+        health.record_failure(provider, model, time.perf_counter() - start, throttled=is_throttle(e))
+        raise
+    health.record_success(provider, model, time.perf_counter() - start)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Hedged requests
+# ---------------------------------------------------------------------------
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_lock = threading.Lock()
+
+
+def hedging_enabled() -> bool:
+    return os.getenv("LLM_HEDGE", "0").lower() in {"1", "true", "yes", "on"}
+
+
+def hedge_delay(provider: str, model: str) -> Optional[float]:
+    """Seconds to wait on ``model`` before hedging, or None without enough stats."""
+    p95 = health.p95(provider, model)
+    return None if p95 is None else max(HEDGE_MIN_DELAY, p95)
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            workers = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+            _hedge_executor = ThreadPoolExecutor(max_workers=max(2, workers), thread_name_prefix="llm-hedge")
+    return _hedge_executor
+
+
+def _submit(fn: Callable[[], Any]) -> Future:
+    # Each thread gets its own context copy so span annotations still land
+    ctx = contextvars.copy_context()
+    return _hedge_pool().submit(ctx.run, fn)
+
+
+def hedged(
+    provider: str,
+    primary: Tuple[str, Callable[[], Any]],
+    backup: Tuple[str, Callable[[], Any]],
+    delay: float,
+) -> Any:
+    """Run ``primary``; if it is still pending after ``delay``, race ``backup``.
+
+    Returns the first successful result. A primary that fails before
+    ``delay`` falls back to ``backup`` straight away. If both fail, the
+    primary's exception is raised. The losing request is left to finish in
+    the background (its outcome still feeds the health stats).
+    """
+    first = _submit(primary[1])
+    done, _ = wait([first], timeout=delay)
+    if done:
+        err = first.exception()
+        if err is None:
+            return first.result()
+        print(f"[LLM] {provider}:{primary[0]} failed before hedging ({err}); trying {backup[0]}")
+        try:
+            return backup[1]()
+        except Exception:
+            raise err
+    print(f"[LLM] hedging {provider}: {primary[0]} exceeded p95 {delay:.2f}s, racing {backup[0]}")
+    second = _submit(backup[1])
+    pending = {first, second}
+    errors: Dict[Future, BaseException] = {}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            err = fut.exception()
+            if err is None:
+                _hedges.inc({"provider": provider, "winner": "primary" if fut is first else "backup"})
+                return fut.result()
+            errors[fut] = err
+    _hedges.inc({"provider": provider, "winner": "none"})
+    raise errors.get(first) or errors[second]
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import contextvars
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..cache import cache_dir
+from ..tracing import annotate, counter, histogram
+
+
+# Lower value = served first. Interactive chat turns may drain a bucket
+# completely; the pipeline agents leave some headroom for them, and batch /
+# background jobs leave more, so under contention they wait the longest.
+PRIORITIES = {"interactive": 0, "scraping": 1, "batch": 2}
+RESERVE = {"interactive": 0.0, "scraping": 0.1, "batch": 0.3}
+DEFAULT_PRIORITY = "scraping"
+
+# Completion tokens are unknown up front; charge this much per request on top
+# of the prompt estimate.
+OUTPUT_TOKENS = int(os.getenv("LLM_RATE_LIMIT_OUTPUT_TOKENS", "512"))
+# Past this, a request goes out anyway (and may be throttled by the provider)
+MAX_WAIT = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "60"))
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("clubapply_llm_priority", default=DEFAULT_PRIORITY)
+
+_waits = histogram("clubapply_llm_rate_limit_wait_seconds", "Time LLM requests queued for rate-limit admission.")
+_admissions = counter("clubapply_llm_rate_limit_total", "Rate-limit admissions by provider, priority and result.")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    level REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+@contextmanager
+def llm_priority(name: str) -> Iterator[None]:
+    """Queue every LLM call made in this context at priority ``name``."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority {name!r}; expected one of {sorted(PRIORITIES)}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def parse_limits(spec: str) -> Dict[str, Tuple[float, float]]:
+    """Parse ``provider[:model]=rpm/tpm,...``; 0 or empty means unlimited.
+
+    Model IDs may contain ``:`` (Bedrock), so only the last ``=`` splits the
+    target from its limits.
+    """
+    limits: Dict[str, Tuple[float, float]] = {}
+    for item in spec.split(","):
+        target, sep, values = item.strip().rpartition("=")
+        if not sep or not target:
+            continue
+        rpm, _, tpm = values.partition("/")
+        try:
+            limits[target.strip()] = (float(rpm or 0), float(tpm or 0))
+        except ValueError:
+            print(f"[RateLimit] ignoring malformed limit {item!r}")
+    return limits
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute token buckets in SQLite.
+
+    Bucket levels live in one SQLite file, so every thread, uvicorn worker
+    and job worker on the host draws from the same quota. Each admission
+    refills and debits the buckets inside an IMMEDIATE transaction; a caller
+    that does not fit sleeps until the buckets should have refilled enough.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, float]], path: Optional[Path] = None):
+        self.limits = limits
+        self.path = Path(path or os.getenv("LLM_RATE_LIMIT_DB") or cache_dir() / "rate_limits.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+
+    def limits_for(self, provider: str, model: str) -> Tuple[float, float]:
+        """Model-specific limits, else the provider's, else unlimited."""
+        return self.limits.get(f"{provider}:{model}") or self.limits.get(provider) or (0.0, 0.0)
+
+    def _try_take(self, key: str, rpm: float, tpm: float, tokens: float, reserve: float) -> float:
+        """Debit both buckets if they fit; return 0, else seconds to wait."""
+        wanted: List[Tuple[str, float, float]] = []
+        if rpm > 0:
+            wanted.append((f"{key}:rpm", rpm, 1.0))
+        if tpm > 0:
+            # A single request larger than the whole bucket waits for a full one
+            wanted.append((f"{key}:tpm", tpm, min(tokens, tpm)))
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                wait = self._debit(conn, wanted, reserve)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            return wait
+        finally:
+            conn.close()
+
+    def _debit(self, conn: sqlite3.Connection, wanted: List[Tuple[str, float, float]], reserve: float) -> float:
+        now = time.time()
+        levels = []
+        wait = 0.0
+        for bucket, capacity, need in wanted:
+            row = conn.execute("SELECT level, updated_at FROM buckets WHERE key = ?", (bucket,)).fetchone()
+            level = capacity if row is None else min(capacity, row[0] + (now - row[1]) * capacity / 60.0)
+            # Lower priorities must leave ``reserve`` of the bucket untouched
+            floor = min(capacity * reserve, capacity - need)
+            if level - need < floor:
+                wait = max(wait, (floor + need - level) * 60.0 / capacity)
+            levels.append((bucket, level, need))
+        if wait == 0.0:
+            for bucket, level, need in levels:
+                conn.execute(
+                    "INSERT OR REPLACE INTO buckets (key, level, updated_at) VALUES (?, ?, ?)",
+                    (bucket, level - need, now),
+                )
+        return wait
+
+    def acquire(self, provider: str, model: str, tokens: int, priority: Optional[str] = None) -> float:
+        """Block until a request of ``tokens`` may be sent; return seconds waited."""
+        rpm, tpm = self.limits_for(provider, model)
+        if rpm <= 0 and tpm <= 0:
+            return 0.0
+        priority = priority or current_priority()
+        reserve = RESERVE.get(priority, RESERVE[DEFAULT_PRIORITY])
+        key = f"{provider}:{model}"
+        start = time.perf_counter()
+        result = "admitted"
+        while True:
+            wait = self._try_take(key, rpm, tpm, tokens + OUTPUT_TOKENS, reserve)
+            if wait == 0.0:
+                break
+            waited = time.perf_counter() - start
+            if waited >= MAX_WAIT:
+                print(f"[RateLimit] {key} still saturated after {waited:.1f}s; sending anyway")
+                result = "timeout"
+                break
+            result = "delayed"
+            # Short, jittered sleeps so higher-priority callers in other
+            # processes get a chance to take the refill first
+            time.sleep(min(wait, 1.0, MAX_WAIT - waited) * random.uniform(0.8, 1.2))
+        waited = time.perf_counter() - start
+        if result != "admitted":
+            print(f"[RateLimit] {key} priority={priority} queued {waited:.2f}s")
+            annotate(rate_limit_wait_ms=round(waited * 1000.0, 1))
+        _waits.observe({"provider": provider, "priority": priority}, waited)
+        _admissions.inc({"provider": provider, "priority": priority, "result": result})
+        return waited
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_spec: Optional[str] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Shared limiter configured by LLM_RATE_LIMITS; None when unset."""
+    global _limiter, _limiter_spec
+    spec = os.getenv("LLM_RATE_LIMITS") or ""
+    if not spec.strip():
+        return None
+    with _limiter_lock:
+        if _limiter is None or spec != _limiter_spec:
+            _limiter = RateLimiter(parse_limits(spec))
+            _limiter_spec = spec
+    return _limiter
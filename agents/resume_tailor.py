@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import json
+import asyncio
 from typing import Optional
 
-from ..schemas import ClubBrief, ResumeSuggestions, model_to_dict
-from ..tools.pdf_reader import read_pdf_text
-from .llm_utils import call_openai_json
+from ..schemas import ClubBrief, ResumeSuggestions
+from ..tools.pdf_reader import read_pdf_text_cached
+from .llm_utils import acall_llm_json, salvage_reply
+from .prompting import fit, model_json
+from ..tracing import annotate
 
 
 SYSTEM_PROMPT = (
@@ -14,29 +16,42 @@ SYSTEM_PROMPT = (
 )
 
 
-async def run(brief: ClubBrief, resume_path: str, club_name: Optional[str] = None, school_name: Optional[str] = None) -> ResumeSuggestions:
+async def run(
+    brief: ClubBrief,
+    resume_path: str,
+    club_name: Optional[str] = None,
+    school_name: Optional[str] = None,
+    resume_text: Optional[str] = None,
+) -> ResumeSuggestions:
     print(f"[ResumeTailorAgent] start resume_path={resume_path}")
-    resume_text = read_pdf_text(resume_path, max_pages=3)
+    if resume_text is None:
+        resume_text = await asyncio.to_thread(read_pdf_text_cached, resume_path, max_pages=3)
 
     sys = SYSTEM_PROMPT.replace("You are a strict resume reviewer.", f"You are a strict resume reviewer for {club_name or 'the club'} at {school_name or 'the school'}.")
     user_prompt = (
-        "ClubBrief:\n" + json.dumps(model_to_dict(brief), indent=2) + "\n\n"
-        + "Resume text (first pages):\n" + resume_text[:8000] + "\n\n"
+        "ClubBrief:\n" + model_json(brief) + "\n\n"
+        + "Resume text (first pages):\n" + fit("resume", resume_text) + "\n\n"
         + "Provide concrete bullet suggestions tailored to the club's keywords and what_matters_most."
     )
 
     print("[ResumeTailorAgent] calling LLM for tailored suggestions...")
-    data = call_openai_json(sys, user_prompt)
+    data = await acall_llm_json(sys, user_prompt, schema=ResumeSuggestions)
     if data:
-        try:
-            # Ensure capped lengths
-            data["top5_fixes"] = (data.get("top5_fixes") or [])[:5]
-            data["tailored_bullets"] = (data.get("tailored_bullets") or [])[:8]
-            return ResumeSuggestions(**data)
-        except Exception:
-            print("[ResumeTailorAgent] LLM JSON parse failed, using fallback")
-
-    # Fallback
+        # Ensure capped lengths
+        for field, cap in (("top5_fixes", 5), ("tailored_bullets", 8)):
+            if isinstance(data.get(field), list):
+                data[field] = data[field][:cap]
+        result = salvage_reply("ResumeTailorAgent", ResumeSuggestions, data, lambda: heuristic(brief))
+        if result is not None:
+            return result
+
+    print("[ResumeTailorAgent] using heuristic fallback")
+    annotate(outcome="fallback")
+    return heuristic(brief)
+
+
+def heuristic(brief: ClubBrief) -> ResumeSuggestions:
+    """Generic resume fixes plus keyword-driven bullet templates."""
     bullets = []
     for kw in (brief.keywords or [])[:5]:
         bullets.append(f"Drove a {kw}-focused project delivering measurable outcomes (e.g., metrics, quality, time).")
@@ -47,7 +62,6 @@ async def run(brief: ClubBrief, resume_path: str, club_name: Optional[str] = Non
         "Tighten formatting to one page (10–11pt).",
         "Ensure consistent tense and punctuation.",
     ]
-    print("[ResumeTailorAgent] using heuristic fallback")
     return ResumeSuggestions(
         top5_fixes=top5,
         tailored_bullets=bullets,
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import json
 from typing import Tuple
 
-from ..schemas import InstagramFindings, WebsiteFindings, ClubBrief, model_to_dict
-from .llm_utils import call_openai_json
+from ..schemas import InstagramFindings, WebsiteFindings, ClubBrief
+from .llm_utils import acall_llm_json, salvage_reply
+from .prompting import model_json
+from ..tracing import annotate
 
 
 SYSTEM_PROMPT = (
@@ -18,26 +19,32 @@ async def run(results: Tuple[InstagramFindings, WebsiteFindings]) -> ClubBrief:
     ig, web = results
 
     user_prompt = (
-        "InstagramFindings:\n" + json.dumps(model_to_dict(ig), indent=2) + "\n\n"
-        + "WebsiteFindings:\n" + json.dumps(model_to_dict(web), indent=2) + "\n\n"
+        "InstagramFindings:\n" + model_json(ig) + "\n\n"
+        + "WebsiteFindings:\n" + model_json(web) + "\n\n"
         + "Fuse to a concise ClubBrief."
     )
 
     print("[SummarizerAgent] calling LLM to fuse findings...")
-    data = call_openai_json(SYSTEM_PROMPT, user_prompt)
+    data = await acall_llm_json(SYSTEM_PROMPT, user_prompt, schema=ClubBrief)
     if data:
-        try:
-            # Ensure exactly 5 items in what_matters_most if possible
-            wmm = data.get("what_matters_most", [])
+        # Ensure exactly 5 items in what_matters_most if possible
+        wmm = data.get("what_matters_most", [])
+        if isinstance(wmm, list):
             if len(wmm) > 5:
                 data["what_matters_most"] = wmm[:5]
             elif len(wmm) < 5:
                 data["what_matters_most"] = wmm + ["impact", "initiative", "teamwork", "quality", "fit"][: 5 - len(wmm)]
-            return ClubBrief(**data)
-        except Exception:
-            print("[SummarizerAgent] LLM JSON parse failed, using fallback")
+        result = salvage_reply("SummarizerAgent", ClubBrief, data, lambda: heuristic(ig, web))
+        if result is not None:
+            return result
 
-    # Fallback deterministic merge
+    print("[SummarizerAgent] using heuristic fallback")
+    annotate(outcome="fallback")
+    return heuristic(ig, web)
+
+
+def heuristic(ig: InstagramFindings, web: WebsiteFindings) -> ClubBrief:
+    """Deterministic merge of the findings into a generic brief."""
     keywords = list({*(ig.keywords or []), *(web.keywords or [])})
     overview = "A student organization with public outreach and events."
     mission_values = (web.mission_values or [])[:3]
@@ -55,7 +62,6 @@ async def run(results: Tuple[InstagramFindings, WebsiteFindings]) -> ClubBrief:
         "fit with mission",
     ]
 
-    print("[SummarizerAgent] using heuristic fallback")
     return ClubBrief(
         overview=overview,
         mission_values=mission_values,
@@ -3,8 +3,10 @@ from __future__ import annotations
 from typing import Optional, List
 
 from ..schemas import WebsiteFindings
-from ..tools.fetch_url import crawl_website
-from .llm_utils import call_openai_json
+from ..tools.crawler import acrawl_website
+from .llm_utils import acall_llm_json, salvage_reply
+from .prompting import fit
+from ..tracing import annotate
 
 
 SYSTEM_PROMPT = (
@@ -22,34 +24,40 @@ async def run(website_url: Optional[str], is_online: bool = True) -> WebsiteFind
     links: List[str] = []
     if is_online:
         print("[WebsiteAgent] crawling website up to 5 pages...")
-        combined_text, links = crawl_website(website_url, max_pages=5)
+        combined_text, links = await acrawl_website(website_url, max_pages=5)
 
     user_prompt = (
         f"URL: {website_url}\n\n"
         f"Pages crawled: {len(links)}\n\n"
-        f"Text (truncated):\n{combined_text[:8000]}\n\n"
+        f"Text (truncated):\n{fit('website', combined_text)}\n\n"
         "Find About/Mission, joining info, events, criteria, links, and keywords."
     )
 
     print("[WebsiteAgent] calling LLM for JSON parse...")
-    data = call_openai_json(SYSTEM_PROMPT, user_prompt)
+    data = await acall_llm_json(SYSTEM_PROMPT, user_prompt, schema=WebsiteFindings)
     if data:
-        try:
-            if "links" not in data:
-                data["links"] = links
-            return WebsiteFindings(**data)
-        except Exception:
-            print("[WebsiteAgent] LLM JSON parse failed, using fallback")
+        if "links" not in data:
+            data["links"] = links
+        result = salvage_reply("WebsiteAgent", WebsiteFindings, data, lambda: heuristic(combined_text, links))
+        if result is not None:
+            return result
 
     # Heuristic fallback parsing
     print("[WebsiteAgent] using heuristic fallback")
+    annotate(outcome="fallback")
+    return heuristic(combined_text, links)
+
+
+def heuristic(combined_text: str = "", links: Optional[List[str]] = None, warnings: Optional[List[str]] = None) -> WebsiteFindings:
+    """Deterministic findings from crawled text via keyword matching (may be empty)."""
+    links = list(links or [])
     about = None
     mission_values: List[str] = []
     how_to_join = None
     events: List[str] = []
     criteria: List[str] = []
     keywords: List[str] = []
-    warnings: List[str] = []
+    warnings = list(warnings or [])
 
     if not combined_text:
         warnings.append("No website content fetched.")
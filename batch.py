@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+
+from .schemas import InputSpec, FinalReport, model_to_dict
+from .orchestrator import run_clubapply
+from .agents.rate_limit import llm_priority
+
+
+DEFAULT_CONCURRENCY = 4
+
+
+def load_manifest(path: Union[str, Path], defaults: Optional[Dict[str, Any]] = None) -> List[InputSpec]:
+    """Read one InputSpec per JSONL line; blank lines and ``#`` comments are skipped.
+
+    ``defaults`` fill fields a line omits (e.g. one student's resumePath and
+    schoolName shared by every club in the manifest).
+    """
+    specs: List[InputSpec] = []
+    with Path(path).open("r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                data = json.loads(line)
+            except Exception as e:
+                raise ValueError(f"{path}:{lineno}: invalid JSON: {e}") from e
+            if not isinstance(data, dict):
+                raise ValueError(f"{path}:{lineno}: expected a JSON object, got {type(data).__name__}")
+            merged = {k: v for k, v in (defaults or {}).items() if v is not None}
+            merged.update(data)
+            try:
+                specs.append(InputSpec(**merged))
+            except ValidationError as e:
+                raise ValueError(f"{path}:{lineno}: {e}") from e
+    return specs
+
+
+async def run_batch(
+    specs: Sequence[InputSpec], concurrency: int = DEFAULT_CONCURRENCY
+) -> AsyncIterator[Tuple[int, Union[FinalReport, Exception]]]:
+    """Run many specs in this process, yielding ``(index, report)`` as each completes.
+
+    At most ``concurrency`` pipelines are in flight at once. A failed run
+    yields its exception instead of aborting the rest of the batch. LLM calls
+    queue at batch priority behind interactive traffic.
+    """
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(idx: int, spec: InputSpec) -> Tuple[int, Union[FinalReport, Exception]]:
+        async with sem:
+            print(f"[Batch] start {idx + 1}/{len(specs)} club={spec.clubName}")
+            try:
+                with llm_priority("batch"):
+                    return idx, await run_clubapply(spec)
+            except Exception as e:
+                print(f"[Batch] failed {idx + 1}/{len(specs)} club={spec.clubName}: {e}")
+                return idx, e
+
+    tasks = [asyncio.ensure_future(_one(i, s)) for i, s in enumerate(specs)]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+def result_to_line(spec: InputSpec, result: Union[FinalReport, Exception]) -> str:
+    """Serialize one batch result as an NDJSON line (a FinalReport or an error record)."""
+    if isinstance(result, Exception):
+        content = {"input": model_to_dict(spec), "error": str(result)}
+    else:
+        content = model_to_dict(result)
+    return json.dumps(content, ensure_ascii=False) + "\n"
@@ -0,0 +1 @@
+"""Offline benchmark suite: fixture sites, a fake LLM provider and generated resumes."""
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ..agents.llm_utils import register_provider
+from ..schemas import json_schema
+
+
+class FakeLLM:
+    """Offline stand-in for an LLM provider.
+
+    Replies are synthesized from the requested schema (so agents validate them
+    like real output) after a configurable latency with jitter. A share of
+    attempts fails with a transport-style error, which exercises the same
+    retry and circuit-breaker path as the real providers. Replies come back
+    as small chunks, so streaming callers see them arrive incrementally.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        failure_rate: float = 0.0,
+        seed: int = 0,
+        chunk_chars: int = 24,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.chunk_chars = chunk_chars
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> tuple:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            failed = self._rng.random() < self.failure_rate
+        return delay, failed
+
+    def reply(self, schema: Optional[type]) -> Dict[str, Any]:
+        if schema is None:
+            return {"reply": "Tell me about a project where you had measurable impact."}
+        js = json_schema(schema)
+        return _example(js, js, "value")
+
+    def __call__(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        model: Optional[str] = None,
+        schema: Optional[type] = None,
+    ) -> List[str]:
+        delay, failed = self._draw()
+        time.sleep(delay)
+        if failed:
+            raise ConnectionError("fake provider: connection reset")
+        text = json.dumps(self.reply(schema))
+        step = self.chunk_chars
+        return [text[i : i + step] for i in range(0, len(text), step)]
+
+
+def _example(node: Dict[str, Any], root: Dict[str, Any], name: str) -> Any:
+    if "$ref" in node:
+        ref = node["$ref"].split("/")[-1]
+        return _example(root.get("$defs", root.get("definitions", {}))[ref], root, name)
+    for key in ("anyOf", "oneOf"):
+        if key in node:
+            options = [o for o in node[key] if o.get("type") != "null"] or node[key]
+            return _example(options[0], root, name)
+    kind = node.get("type")
+    if kind == "object":
+        props = node.get("properties")
+        if not props:
+            return {"item": f"{name} detail", "note": f"{name} note"}
+        return {k: _example(v, root, k) for k, v in props.items()}
+    if kind == "array":
+        return [_example(node.get("items", {"type": "string"}), root, f"{name} {i + 1}") for i in range(3)]
+    if kind in ("integer", "number"):
+        return 1
+    if kind == "boolean":
+        return True
+    return f"Synthetic {name.replace('_', ' ')} for benchmarking."
+
+
+def install(fake: FakeLLM, name: str = "fake") -> FakeLLM:
+    """Register ``fake`` as provider ``name`` (select it with LLM_PROVIDER)."""
+    register_provider(name, fake, default_model="fake-model")
+    return fake
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+
+WORDS = (
+    "club members project workshop mentorship research community students team build "
+    "design data science engineering outreach volunteer leadership impact events weekly "
+    "meeting application deadline recruit interview portfolio hackathon speaker panel "
+    "industry alumni network mission values innovation collaboration growth learning"
+).split()
+
+SUBPAGES = ("about", "events", "join", "team", "projects", "faq", "blog", "contact")
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 18))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraphs(rng: random.Random, count: int) -> List[str]:
+    return [" ".join(_sentence(rng) for _ in range(rng.randint(3, 7))) for _ in range(count)]
+
+
+def _page(title: str, nav: List[str], body: List[str], extra_head: str = "") -> str:
+    links = "".join(f'<li><a href="{href}">{escape(href.strip("/").split("/")[-1] or "home")}</a></li>' for href in nav)
+    paras = "".join(f"<p>{escape(p)}</p>" for p in body)
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{escape(title)}</title>"
+        '<meta charset="utf-8">'
+        f"{extra_head}"
+        "<style>body{font-family:sans-serif} .nav li{display:inline}</style>"
+        "<script>window.analytics=[];function track(e){analytics.push(e)}</script>"
+        "</head><body>"
+        f'<header><ul class="nav">{links}</ul></header>'
+        f"<main><h1>{escape(title)}</h1>{paras}</main>"
+        "<footer><p>&copy; Club. All rights reserved.</p>"
+        "<noscript>Enable JavaScript for the full experience.</noscript></footer>"
+        "</body></html>"
+    )
+
+
+def build_site(slug: str, seed: int = 0, paragraphs: int = 12) -> Dict[str, str]:
+    """Synthetic club site: path -> HTML for a home page and its subpages."""
+    rng = random.Random(f"{seed}:{slug}")
+    name = slug.replace("-", " ").title()
+    base = f"/clubs/{slug}/"
+    nav = [base] + [f"{base}{p}/" for p in SUBPAGES]
+    pages = {base: _page(name, nav, _paragraphs(rng, paragraphs))}
+    for p in SUBPAGES:
+        pages[f"{base}{p}/"] = _page(f"{name} - {p.title()}", nav, _paragraphs(rng, paragraphs))
+    return pages
+
+
+def build_instagram(slug: str, seed: int = 0) -> str:
+    """A public-profile-like page: mostly script and meta tags, little visible text."""
+    rng = random.Random(f"{seed}:ig:{slug}")
+    desc = f"{rng.randint(200, 5000)} Followers, {rng.randint(10, 500)} Posts - {_sentence(rng)}"
+    head = (
+        f'<meta property="og:title" content="{escape(slug)} on Instagram">'
+        f'<meta property="og:description" content="{escape(desc)}">'
+        f'<meta name="description" content="{escape(desc)}">'
+    )
+    captions = ",".join(f'{{"text": "{_sentence(rng)}"}}' for _ in range(12))
+    script = f'<script type="application/json">{{"posts": [{captions}]}}</script>'
+    bundle = "<script>" + ("var x=" + "1+" * 2000 + "1;") * 5 + "</script>"
+    return _page(f"@{slug}", [], _paragraphs(rng, 2), extra_head=head + script + bundle)
+
+
+def build_large_page(seed: int = 0, sections: int = 60) -> str:
+    """A representative heavy page (~230 KB): deep nesting, many links, tables,
+    inline scripts, OpenGraph tags and JSON-LD, like a CMS-built club site."""
+    rng = random.Random(f"{seed}:large")
+    head = (
+        '<meta name="description" content="A large synthetic club page.">'
+        '<meta property="og:title" content="Large Club"><meta property="og:type" content="website">'
+        '<script type="application/ld+json">{"@context": "https://schema.org", "@type": "Organization", '
+        '"name": "Large Club", "sameAs": ["https://instagram.com/large_club"]}</script>'
+    )
+    blocks = []
+    for i in range(sections):
+        links = "".join(f'<li><a href="/clubs/large/{rng.choice(SUBPAGES)}/{i}-{j}/">{rng.choice(WORDS)}</a></li>' for j in range(10))
+        rows = "".join(
+            f"<tr><td>{escape(rng.choice(WORDS))}</td><td>{escape(_sentence(rng))}</td></tr>" for _ in range(5)
+        )
+        paras = "".join(f"<p><span>{escape(p)}</span></p>" for p in _paragraphs(rng, 4))
+        blocks.append(
+            f'<section id="s{i}"><div class="row"><div class="col"><h2>{escape(_sentence(rng))}</h2>{paras}</div>'
+            f'<div class="col"><ul>{links}</ul><table>{rows}</table></div></div>'
+            f"<script>window.__s{i}={{views:{rng.randint(1, 999)}}};</script></section>"
+        )
+    return _page("Large Club", [f"/clubs/large/{p}/" for p in SUBPAGES], [], extra_head=head).replace(
+        "</main>", "".join(blocks) + "</main>"
+    )
+
+
+class FixtureSites:
+    """In-memory content for a set of synthetic clubs."""
+
+    def __init__(self, slugs: List[str], seed: int = 0):
+        self.slugs = slugs
+        self.pages: Dict[str, str] = {}
+        for slug in slugs:
+            self.pages.update(build_site(slug, seed))
+            self.pages[f"/instagram/{slug}/"] = build_instagram(slug, seed)
+
+
+def _handler(sites: FixtureSites, latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Send headers and body in one segment; otherwise delayed ACKs add
+        # ~40ms per keep-alive request and swamp what is being measured
+        wbufsize = 1 << 16
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:  # noqa: N802
+            if latency:
+                time.sleep(latency)
+            body = sites.pages.get(self.path.split("?")[0])
+            status = 200 if body is not None else 404
+            data = (body or "<html><body>Not found</body></html>").encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args) -> None:  # quiet
+            pass
+
+    return Handler
+
+
+@contextmanager
+def serve_fixtures(sites: FixtureSites, latency: float = 0.0, port: int = 0) -> Iterator[str]:
+    """Serve ``sites`` on localhost for the duration of the block; yields the base URL.
+
+    ``latency`` adds a fixed delay per request to stand in for network time.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(sites, latency))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def site_url(base: str, slug: str) -> str:
+    return f"{base}/clubs/{slug}/"
+
+
+def instagram_url(base: str, slug: str) -> str:
+    return f"{base}/instagram/{slug}/"
+
+
+def default_slugs(count: Optional[int] = None) -> List[str]:
+    slugs = ["data-science-union", "robotics-society", "design-collective", "finance-club", "ai-safety-lab"]
+    return slugs[: count or len(slugs)]
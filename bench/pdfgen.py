@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import List
+
+from .fixtures import WORDS
+
+SECTIONS = ("Education", "Experience", "Projects", "Leadership", "Skills")
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def resume_lines(seed: int = 0, lines: int = 120) -> List[str]:
+    rng = random.Random(f"resume:{seed}")
+    out = ["Jordan Example", "jordan@example.edu | (555) 010-0000"]
+    per_section = max(1, lines // len(SECTIONS))
+    for section in SECTIONS:
+        out.append(section.upper())
+        for _ in range(per_section):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(8, 14))]
+            out.append("- " + " ".join(words).capitalize() + f", improving results by {rng.randint(5, 60)}%.")
+    return out
+
+
+def write_pdf(path: Path, lines: List[str], lines_per_page: int = 48) -> Path:
+    """Write a plain text-only PDF (Helvetica, one line per row) without extra deps."""
+    pages = [lines[i : i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    pages_obj = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for page_lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 760 Td"]
+        for line in page_lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_obj, font, content)
+            )
+        )
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_obj
+    objects[pages_obj - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids),
+        len(kids),
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(out))
+    return path
+
+
+def sample_resume(directory: Path, seed: int = 0, lines: int = 120) -> Path:
+    """A multi-page resume-like PDF under ``directory``."""
+    return write_pdf(Path(directory) / f"resume_{seed}_{lines}.pdf", resume_lines(seed, lines))
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .fake_llm import FakeLLM, install
+from .fixtures import FixtureSites, build_large_page, default_slugs, instagram_url, serve_fixtures, site_url
+from .pdfgen import sample_resume
+
+DEFAULT_OUT_DIR = Path(__file__).resolve().parent.parent / "out" / "bench"
+
+SAMPLE_REPLY = {
+    "similar_experiences_summary": "Prepare stories about projects, leadership and teamwork.",
+    "likely_questions": [f"Question {i} about the club's mission and your experience?" for i in range(12)],
+    "stories_to_prepare": [f"Story {i}" for i in range(6)],
+    "quick_pitch_template": "Hi, I'm [Name]...",
+    "followup_questions": [f"Follow-up {i}?" for i in range(5)],
+    "links": [f"https://example.edu/page/{i}" for i in range(5)],
+}
+PARSE_LOOPS = 200
+
+
+def _two_pass_bs4(html: str, url: str) -> tuple:
+    """The previous extraction: separate BeautifulSoup parses for text and links."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style", "noscript"]):
+        tag.extract()
+    text = " ".join(soup.get_text(" \n ").split())
+    links = [a.get("href") for a in BeautifulSoup(html, "html.parser").find_all("a", href=True)]
+    return text, links
+
+
+def _parse_benchmarks(html: str, url: str) -> List[Tuple[str, Callable[[], Any]]]:
+    """Per-page extraction on a large page: old two-pass parse vs each backend."""
+    from ..tools import html_extract
+
+    benches: List[Tuple[str, Callable[[], Any]]] = []
+    try:
+        import bs4  # noqa: F401
+
+        benches.append(("parse_large.bs4_two_pass", lambda: _two_pass_bs4(html, url)))
+    except ImportError:
+        pass
+    if html_extract.lxml is not None:
+        benches.append(("parse_large.lxml", lambda: html_extract._extract_lxml(html, url)))
+    benches.append(("parse_large.html_parser", lambda: html_extract._extract_stdlib(html, url)))
+    return benches
+
+
+def _stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "min": round(ordered[0], 3),
+        "median": round(statistics.median(ordered), 3),
+        "mean": round(statistics.fmean(ordered), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def measure(name: str, fn: Callable[[], Any], repeat: int, warmup: int = 1) -> Dict[str, Any]:
+    """Wall and CPU time over ``repeat`` runs, plus peak traced memory of one more run.
+
+    Memory is measured in a separate run because tracemalloc itself slows
+    allocation-heavy code down and would skew the timings.
+    """
+    for _ in range(warmup):
+        fn()
+    walls: List[float] = []
+    cpus: List[float] = []
+    for _ in range(repeat):
+        c0 = time.process_time()
+        w0 = time.perf_counter()
+        fn()
+        walls.append((time.perf_counter() - w0) * 1000.0)
+        cpus.append((time.process_time() - c0) * 1000.0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "name": name,
+        "repeat": repeat,
+        "wall_ms": _stats(walls),
+        "cpu_ms": _stats(cpus),
+        "peak_kib": round(peak / 1024.0, 1),
+    }
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def build_benchmarks(base: str, sites: FixtureSites, pdf: Path) -> List[Tuple[str, Callable[[], Any]]]:
+    # Imported here so the offline environment (cache dir, provider) is set first
+    from ..agents import (
+        application_coach,
+        instagram_agent,
+        interview_coach,
+        resume_tailor,
+        summarizer_agent,
+        website_agent,
+    )
+    from ..agents.llm_utils import try_parse_json
+    from ..orchestrator import run_clubapply
+    from ..schemas import InputSpec
+    from ..tools.dedup import dedupe_pages
+    from ..tools.fetch_url import crawl_website, extract_visible_text
+    from ..tools.pdf_reader import read_pdf_text
+
+    slug = sites.slugs[0]
+    home_html = sites.pages[f"/clubs/{slug}/"]
+    site_texts = [extract_visible_text(html) for path, html in sites.pages.items() if path.startswith(f"/clubs/{slug}/")]
+    web_url = site_url(base, slug)
+    ig_url = instagram_url(base, slug)
+    questions = ["Why do you want to join?", "Describe a project you led.", "What would you contribute?"]
+    raw_reply = "```json\n" + json.dumps(SAMPLE_REPLY, indent=2).replace("]\n", ",]\n") + "\n```"
+
+    ig = asyncio.run(instagram_agent.run(ig_url))
+    web = asyncio.run(website_agent.run(web_url))
+    brief = asyncio.run(summarizer_agent.run((ig, web)))
+    spec = InputSpec(
+        clubName=slug.replace("-", " ").title(),
+        schoolName="Bench University",
+        instagramUrl=ig_url,
+        websiteUrl=web_url,
+        resumePath=str(pdf),
+        applicationQuestions=questions,
+        isOnline=True,
+    )
+
+    def _parse_many() -> None:
+        for _ in range(PARSE_LOOPS):
+            try_parse_json(raw_reply)
+
+    large_url = f"{base}/clubs/large/"
+    return _parse_benchmarks(build_large_page(), large_url) + [
+        ("extract_visible_text", lambda: extract_visible_text(home_html)),
+        ("crawl_website", lambda: crawl_website(web_url, max_pages=5)),
+        ("dedupe_pages", lambda: dedupe_pages(site_texts)),
+        ("read_pdf_text", lambda: read_pdf_text(str(pdf), max_pages=3)),
+        (f"try_parse_json_x{PARSE_LOOPS}", _parse_many),
+        ("agent.instagram", lambda: asyncio.run(instagram_agent.run(ig_url))),
+        ("agent.website", lambda: asyncio.run(website_agent.run(web_url))),
+        ("agent.summarizer", lambda: asyncio.run(summarizer_agent.run((ig, web)))),
+        ("agent.resume_tailor", lambda: asyncio.run(resume_tailor.run(brief, str(pdf), spec.clubName, spec.schoolName))),
+        ("agent.application_coach", lambda: asyncio.run(application_coach.run(brief, questions))),
+        ("agent.interview_coach", lambda: asyncio.run(interview_coach.run(brief))),
+        ("run_clubapply", lambda: asyncio.run(run_clubapply(spec))),
+    ]
+
+
+def compare(results: Dict[str, Any], baseline_path: Path) -> List[str]:
+    """Median wall/CPU change per benchmark against an earlier results file."""
+    baseline = {b["name"]: b for b in json.loads(baseline_path.read_text())["benchmarks"]}
+    lines = []
+    for b in results["benchmarks"]:
+        old = baseline.get(b["name"])
+        if old is None:
+            continue
+        deltas = []
+        for metric in ("wall_ms", "cpu_ms"):
+            before, after = old[metric]["median"], b[metric]["median"]
+            pct = (after - before) / before * 100.0 if before else 0.0
+            deltas.append(f"{metric} {before:.1f} -> {after:.1f} ({pct:+.1f}%)")
+        lines.append(f"{b['name']:<28} " + "  ".join(deltas))
+    return lines
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    workdir = Path(tempfile.mkdtemp(prefix="clubapply_bench_"))
+    # Fully offline and uncached: every run does the real work
+    os.environ.update(
+        {
+            "LLM_PROVIDER": "fake",
+            "LLM_CACHE": "0",
+            "CLUBAPPLY_STAGE_CACHE": "0",
+            "HTTP_CACHE": "0",
+            "INSTAGRAM_SNAPSHOT_TTL": "0",
+            "CLUBAPPLY_CACHE_DIR": str(workdir / "cache"),
+        }
+    )
+    os.environ.pop("LLM_RATE_LIMITS", None)
+    fake = install(
+        FakeLLM(latency=args.llm_latency, jitter=args.llm_jitter, failure_rate=args.llm_failure_rate, seed=args.seed)
+    )
+    sites = FixtureSites(default_slugs(), seed=args.seed)
+    pdf = sample_resume(workdir, seed=args.seed, lines=args.resume_lines)
+
+    results: Dict[str, Any] = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "git_rev": _git_rev(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": {
+            "repeat": args.repeat,
+            "llm_latency": args.llm_latency,
+            "llm_jitter": args.llm_jitter,
+            "llm_failure_rate": args.llm_failure_rate,
+            "http_latency": args.http_latency,
+            "resume_lines": args.resume_lines,
+            "seed": args.seed,
+        },
+        "benchmarks": [],
+    }
+    quiet = contextlib.redirect_stdout(io.StringIO()) if not args.verbose else contextlib.nullcontext()
+    with serve_fixtures(sites, latency=args.http_latency) as base:
+        with quiet:
+            benches = build_benchmarks(base, sites, pdf)
+        for name, fn in benches:
+            if args.only and not any(o in name for o in args.only):
+                continue
+            with quiet:
+                result = measure(name, fn, args.repeat)
+            results["benchmarks"].append(result)
+            print(
+                f"{name:<28} wall {result['wall_ms']['median']:>9.1f} ms  "
+                f"cpu {result['cpu_ms']['median']:>9.1f} ms  peak {result['peak_kib']:>9.1f} KiB"
+            )
+    results["llm_calls"] = fake.calls
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline ClubApply benchmarks (fixture sites + fake LLM)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark (default: 5)")
+    parser.add_argument("--only", nargs="*", default=None, help="Run benchmarks whose name contains any of these")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency in seconds (default: 0.05)")
+    parser.add_argument("--llm-jitter", type=float, default=0.02, help="Fake LLM latency jitter in seconds (default: 0.02)")
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0, help="Share of fake LLM attempts that fail (default: 0)")
+    parser.add_argument("--http-latency", type=float, default=0.01, help="Fixture server delay per request (default: 0.01)")
+    parser.add_argument("--resume-lines", type=int, default=120, help="Lines in the generated resume PDF (default: 120)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for fixtures and fake LLM (default: 0)")
+    parser.add_argument("--output", default=None, help="Results JSON path (default: out/bench/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to diff against")
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline logs while benchmarking")
+    args = parser.parse_args()
+
+    results = run(args)
+    out_path = Path(args.output) if args.output else DEFAULT_OUT_DIR / f"{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Saved results → {out_path}")
+    if args.compare:
+        print(f"\nChange vs {args.compare}:")
+        for line in compare(results, Path(args.compare)):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
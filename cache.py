@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from .tracing import counter
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+_requests = counter("clubapply_cache_requests_total", "Cache lookups by cache name and result.")
+
+
+def cache_dir() -> Path:
+    return Path(os.getenv("CLUBAPPLY_CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+def stable_hash(material: Any) -> str:
+    """sha256 of a JSON-serializable value with a canonical key order."""
+    canonical = json.dumps(material, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    size INTEGER NOT NULL DEFAULT 0,
+    accessed_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_idx ON entries (accessed_at);
+"""
+
+
+class DiskCache:
+    """Persistent JSON key/value store in a single SQLite file.
+
+    Safe to share between threads and processes; each call uses its own
+    short-lived connection. With ``max_bytes`` set, the least recently read
+    entries are evicted once the stored values exceed that size.
+    """
+
+    # Check the size bound every N writes rather than on each one
+    EVICT_EVERY = 32
+
+    def __init__(
+        self,
+        name: str,
+        default_ttl: Optional[float] = None,
+        path: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.name = name
+        self.path = Path(path or cache_dir() / f"{name}.sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self._writes = 0
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Files created before size/accessed_at existed get the columns added
+            cols = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if cols and "size" not in cols:
+                conn.execute("ALTER TABLE entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            if cols and "accessed_at" not in cols:
+                conn.execute("ALTER TABLE entries ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """``(value, expires_at)`` for a live entry, else None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is not None and row[1] is not None and row[1] < now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                _requests.inc({"cache": self.name, "result": "miss"})
+                return None
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            _requests.inc({"cache": self.name, "result": "disk_hit"})
+            return json.loads(row[0]), row[1]
+        finally:
+            conn.close()
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        payload = json.dumps(value, ensure_ascii=False)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, expires_at, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, now, expires_at, len(payload), now),
+            )
+            self._writes += 1
+            if self.max_bytes and self._writes % self.EVICT_EVERY == 1:
+                self._evict(conn)
+        finally:
+            conn.close()
+
+    def delete(self, key: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop the least recently read entries until back under 90% of the cap
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        print(f"[cache] {self.name}: evicted {len(doomed)} entries ({freed} bytes)")
+
+
+class LRUCache:
+    """Thread-safe bounded in-memory LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, Tuple[Optional[float], Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class TieredCache:
+    """Memory LRU in front of a DiskCache; disk hits are promoted to memory
+    for the rest of their lifetime."""
+
+    def __init__(
+        self,
+        name: str,
+        default_ttl: Optional[float] = None,
+        memory_entries: int = 512,
+        max_bytes: Optional[int] = None,
+    ):
+        self.name = name
+        self.default_ttl = default_ttl
+        self.memory = LRUCache(memory_entries)
+        self.disk = DiskCache(name, default_ttl=default_ttl, max_bytes=max_bytes)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            _requests.inc({"cache": self.name, "result": "memory_hit"})
+            return value
+        entry = self.disk.get_entry(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is None:
+            self.memory.set(key, value)
+        else:
+            self.memory.set(key, value, max(0.001, expires_at - time.time()))
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self.memory.set(key, value, ttl)
+        self.disk.set(key, value, ttl)
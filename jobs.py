@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .schemas import InputSpec, model_to_dict
+from .orchestrator import REPORT_STAGES, run_clubapply
+from .agents.rate_limit import llm_priority
+
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / "out" / "jobs.sqlite3"
+# A running job whose lease lapses (worker crashed or was restarted) is
+# handed to the next worker that polls.
+LEASE_SECONDS = 60.0
+# Jobs that keep killing their worker are failed instead of re-claimed forever.
+MAX_ATTEMPTS = 3
+POLL_INTERVAL = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT UNIQUE,
+    spec_hash TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT NOT NULL DEFAULT '[]',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_spec_hash_idx ON jobs (spec_hash, status);
+"""
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def default_db_path() -> Path:
+    return Path(os.getenv("CLUBAPPLY_JOBS_DB") or DEFAULT_DB_PATH)
+
+
+def spec_hash(spec: InputSpec) -> str:
+    canonical = json.dumps(model_to_dict(spec), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """SQLite-backed job queue shared by the API process and worker processes.
+
+    Every state transition runs in an IMMEDIATE transaction, so concurrent
+    submitters and workers (in any process) see a consistent queue.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or default_db_path())
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def submit(self, spec: InputSpec, idempotency_key: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Enqueue a run. Returns ``(job, created)``.
+
+        A job with the same idempotency key, or an identical spec that is still
+        queued or running, is returned instead of enqueuing a duplicate.
+        """
+        h = spec_hash(spec)
+        now = time.time()
+        with self._tx() as conn:
+            row = None
+            if idempotency_key:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE idempotency_key = ?", (idempotency_key,)
+                ).fetchone()
+            if row is None:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE spec_hash = ? AND status IN (?, ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (h, *ACTIVE_STATUSES),
+                ).fetchone()
+            if row is not None:
+                return _row_to_job(row), False
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, idempotency_key, spec_hash, spec, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, idempotency_key, h, json.dumps(model_to_dict(spec)), now, now),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return _row_to_job(row), True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._tx() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row is not None else None
+
+    def claim(self, lease_seconds: float = LEASE_SECONDS) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued job (or one whose lease lapsed)."""
+        now = time.time()
+        with self._tx() as conn:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["attempts"] >= MAX_ATTEMPTS:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                    (f"worker lost after {row['attempts']} attempts", now, row["id"]),
+                )
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                "lease_until = ?, updated_at = ? WHERE id = ?",
+                (now + lease_seconds, now, row["id"]),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return _row_to_job(row)
+
+    def renew(self, job_id: str, lease_seconds: float = LEASE_SECONDS) -> None:
+        now = time.time()
+        with self._tx() as conn:
+            conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+                (now + lease_seconds, now, job_id),
+            )
+
+    def add_progress(self, job_id: str, stage: str) -> None:
+        with self._tx() as conn:
+            row = conn.execute("SELECT progress FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            done = json.loads(row["progress"] or "[]")
+            if stage not in done:
+                done.append(stage)
+            conn.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(done), time.time(), job_id),
+            )
+
+    def finish(self, job_id: str, result: Dict[str, Any]) -> None:
+        with self._tx() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._tx() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL, updated_at = ? WHERE id = ?",
+                (error, time.time(), job_id),
+            )
+
+
+def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+    completed = json.loads(row["progress"] or "[]")
+    return {
+        "job_id": row["id"],
+        "status": row["status"],
+        "progress": {"completed": completed, "total": len(REPORT_STAGES)},
+        "attempts": row["attempts"],
+        "input": json.loads(row["spec"]),
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+def _run_job(store: JobStore, job: Dict[str, Any]) -> None:
+    job_id = job["job_id"]
+    spec = InputSpec(**job["input"])
+
+    # Keep the lease alive from a thread: agent steps may block the event loop.
+    stop = threading.Event()
+
+    def _heartbeat() -> None:
+        while not stop.wait(LEASE_SECONDS / 3):
+            store.renew(job_id)
+
+    hb = threading.Thread(target=_heartbeat, daemon=True)
+    hb.start()
+
+    async def _on_stage(name: str, _section) -> None:
+        await asyncio.to_thread(store.add_progress, job_id, name)
+
+    try:
+        print(f"[Jobs] worker pid={os.getpid()} running job={job_id} club={spec.clubName}")
+        with llm_priority("batch"):
+            report = asyncio.run(run_clubapply(spec, on_stage=_on_stage))
+        store.finish(job_id, model_to_dict(report))
+        print(f"[Jobs] job={job_id} done")
+    except Exception as e:
+        print(f"[Jobs] job={job_id} failed: {e}")
+        store.fail(job_id, f"{type(e).__name__}: {e}")
+    finally:
+        stop.set()
+        hb.join(timeout=1.0)
+
+
+def worker_loop(db_path: Optional[str] = None, poll_interval: float = POLL_INTERVAL) -> None:
+    """Poll the queue forever, running one job at a time."""
+    store = JobStore(Path(db_path) if db_path else None)
+    print(f"[Jobs] worker pid={os.getpid()} polling {store.db_path}")
+    while True:
+        job = store.claim()
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        _run_job(store, job)
+
+
+def start_workers(count: int, db_path: Optional[Path] = None) -> List[multiprocessing.Process]:
+    """Spawn ``count`` worker processes sharing the SQLite queue."""
+    ctx = multiprocessing.get_context("spawn")
+    procs = []
+    for _ in range(max(0, count)):
+        p = ctx.Process(target=worker_loop, args=(str(db_path or default_db_path()),), daemon=True)
+        p.start()
+        procs.append(p)
+    return procs
+
+
+def stop_workers(procs: List[multiprocessing.Process], timeout: float = 5.0) -> None:
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        p.join(timeout=timeout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ClubApply job workers")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes (default: 2)")
+    parser.add_argument("--db", default=None, help="SQLite queue path (default: $CLUBAPPLY_JOBS_DB or out/jobs.sqlite3)")
+    args = parser.parse_args()
+    if args.workers <= 1:
+        worker_loop(args.db)
+        return
+    procs = start_workers(args.workers, Path(args.db) if args.db else None)
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        stop_workers(procs)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ from typing import Optional, List
 
 from .schemas import InputSpec, model_to_dict
 from .orchestrator import run_clubapply
+from .batch import DEFAULT_CONCURRENCY, load_manifest, run_batch, result_to_line
 from .agents.interview_coach import InterviewChat
 
 
@@ -17,11 +18,11 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="ClubApply Strands – multi-agent CLI to tailor applications."
     )
-    parser.add_argument("--club", required=True, help="Club name")
-    parser.add_argument("--school", required=True, help="School name")
+    parser.add_argument("--club", default=None, help="Club name")
+    parser.add_argument("--school", default=None, help="School name")
     parser.add_argument("--instagram", dest="instagram", default=None, help="Instagram URL")
     parser.add_argument("--website", dest="website", default=None, help="Website URL")
-    parser.add_argument("--resume", dest="resume", required=True, help="Path to resume PDF")
+    parser.add_argument("--resume", dest="resume", default=None, help="Path to resume PDF")
     parser.add_argument(
         "--questions",
         dest="questions",
@@ -34,13 +35,37 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Fetch live website/Instagram (default: False)",
     )
+    parser.add_argument(
+        "--fused",
+        dest="fused",
+        action="store_true",
+        help="Generate all coaching sections in one LLM call",
+    )
     parser.add_argument(
         "--chat",
         dest="chat",
         action="store_true",
         help="Enter interview chat after generating report",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--batch",
+        dest="batch",
+        default=None,
+        help="JSONL manifest with one InputSpec per line; --school/--resume/--online act as defaults",
+    )
+    parser.add_argument(
+        "--concurrency",
+        dest="concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Max pipelines in flight in --batch mode (default: {DEFAULT_CONCURRENCY})",
+    )
+    args = parser.parse_args()
+    if not args.batch:
+        missing = [f"--{n}" for n in ("club", "school", "resume") if not getattr(args, n)]
+        if missing:
+            parser.error(f"the following arguments are required: {', '.join(missing)}")
+    return args
 
 
 def ensure_out_dir() -> Path:
@@ -62,10 +87,38 @@ def parse_questions(q: Optional[str]) -> Optional[List[str]]:
     return [s.strip() for s in q.split("||") if s.strip()] or None
 
 
+async def run_batch_mode(args: argparse.Namespace) -> None:
+    defaults = {
+        "schoolName": args.school,
+        "resumePath": args.resume,
+        "isOnline": True if args.online else None,
+        "fusedCoaching": True if args.fused else None,
+    }
+    specs = load_manifest(args.batch, defaults=defaults)
+    print(f"Running batch of {len(specs)} specs (concurrency={args.concurrency}) ...")
+
+    out_dir = ensure_out_dir()
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    out_path = out_dir / f"{ts}_batch.jsonl"
+    failed = 0
+    with out_path.open("w", encoding="utf-8") as f:
+        async for idx, result in run_batch(specs, concurrency=args.concurrency):
+            if isinstance(result, Exception):
+                failed += 1
+            f.write(result_to_line(specs[idx], result))
+            f.flush()
+    print(f"Batch complete: {len(specs) - failed} ok, {failed} failed")
+    print(f"Saved reports → {out_path}")
+
+
 async def main_async():
     args = parse_args()
 
     print("Starting ClubApply Strands...")
+    if args.batch:
+        await run_batch_mode(args)
+        return
+
     input_spec = InputSpec(
         clubName=args.club,
         schoolName=args.school,
@@ -74,6 +127,7 @@ async def main_async():
         resumePath=args.resume,
         applicationQuestions=parse_questions(args.questions),
         isOnline=bool(args.online),
+        fusedCoaching=True if args.fused else None,
     )
 
     print("Running InstagramAgent ...")
@@ -104,7 +158,7 @@ async def main_async():
                 user = input("you> ").strip()
                 if user.lower() in {"exit", "quit"}:
                     break
-                reply = chat.chat(user)
+                reply = await chat.achat(user)
                 print(f"coach> {reply}\n")
         except KeyboardInterrupt:
             print("\nBye!")
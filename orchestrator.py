@@ -1,15 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from datetime import datetime
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+from .cache import DiskCache, stable_hash
 from .schemas import (
+    model_to_dict,
     InputSpec,
     FinalReport,
     InstagramFindings,
     WebsiteFindings,
+    ClubBrief,
+    ResumeSuggestions,
+    ApplicationSuggestions,
+    InterviewPrep,
 )
+from .stage_graph import Stage, StageCallback, run_stage_graph
+from .tracing import collect_spans
+from .tools.pdf_reader import read_pdf_text_cached
+from .agents.json_stream import PartialEvent
+from .agents.llm_utils import stream_partials
 from .agents import (
     instagram_agent,
     website_agent,
@@ -17,66 +29,272 @@ from .agents import (
     resume_tailor,
     application_coach,
     interview_coach,
+    fused_coach,
 )
 
 
-async def _run_swarm(tasks):
-    """Robustly resolve Strands swarm across layouts, else fallback to asyncio.gather."""
-    # Preferred: function export
-    try:
-        from strands.multiagent.swarm import swarm as s  # type: ignore
-        if callable(s):
-            return await s(tasks)
-        if hasattr(s, "swarm") and callable(s.swarm):  # submodule exposing .swarm
-            return await s.swarm(tasks)
-    except Exception:
-        pass
-    # Alternative: module import then attribute
-    try:
-        from strands.multiagent import swarm as s2  # type: ignore
-        if callable(s2):
-            return await s2(tasks)
-        if hasattr(s2, "swarm") and callable(s2.swarm):
-            return await s2.swarm(tasks)
-    except Exception:
-        pass
-    # Fallback: asyncio
-    return await asyncio.gather(*tasks)
-
-
-async def run_clubapply(input_data: InputSpec) -> FinalReport:
-    print("[Orchestrator] Launching IG + Web tasks in parallel")
-    ig_task = instagram_agent.run(input_data.instagramUrl, is_online=input_data.isOnline)
-    web_task = website_agent.run(input_data.websiteUrl, is_online=input_data.isOnline)
-
-    ig_res: Optional[InstagramFindings]
-    web_res: Optional[WebsiteFindings]
-
-    ig_res, web_res = await _run_swarm([ig_task, web_task])
-    print("[Orchestrator] Received IG + Web outputs")
-
-    print("[Orchestrator] Running summarizer agent")
-    summary = await summarizer_agent.run((ig_res, web_res))
-
-    print("[Orchestrator] Running resume tailor agent")
-    resume = await resume_tailor.run(
-        summary, input_data.resumePath, input_data.clubName, input_data.schoolName
-    )
-    print("[Orchestrator] Running application coach agent")
-    application = await application_coach.run(summary, input_data.applicationQuestions)
-    print("[Orchestrator] Running interview coach agent")
-    interview = await interview_coach.run(summary)
+PartialCallback = Callable[[str, PartialEvent], Awaitable[None]]
+
+# Stages whose outputs are FinalReport sections; the rest are internal inputs.
+REPORT_STAGES = ("instagram", "website", "brief", "resume", "application", "interview")
+
+# Cumulative share of the latency budget by which each stage must finish:
+# scraping gets the first 45%, the summarizer runs until 70%, and the coaches
+# until the end of the budget.
+BUDGET_SPLIT = {
+    "instagram": 0.45,
+    "website": 0.45,
+    "resume_text": 0.45,
+    "brief": 0.70,
+    "coaching": 1.0,
+    "resume": 1.0,
+    "application": 1.0,
+    "interview": 1.0,
+}
+
+_stage_cache: Optional[DiskCache] = None
+
+
+def get_stage_cache() -> Optional[DiskCache]:
+    """Shared stage memo store; disabled with CLUBAPPLY_STAGE_CACHE=0."""
+    global _stage_cache
+    if os.getenv("CLUBAPPLY_STAGE_CACHE", "1").lower() in {"0", "false", "no", "off"}:
+        return None
+    if _stage_cache is None:
+        ttl = float(os.getenv("CLUBAPPLY_STAGE_CACHE_TTL", str(24 * 3600)))
+        _stage_cache = DiskCache("stages_v1", default_ttl=ttl)
+    return _stage_cache
+
+
+def latency_budget(input_data: InputSpec) -> Optional[float]:
+    """Per-run budget from the spec, else the CLUBAPPLY_LATENCY_BUDGET setting."""
+    if input_data.latencyBudgetSec:
+        return input_data.latencyBudgetSec
+    env = os.getenv("CLUBAPPLY_LATENCY_BUDGET")
+    return float(env) if env else None
+
+
+def fused_coaching(input_data: InputSpec) -> bool:
+    """Per-run flag from the spec, else the CLUBAPPLY_FUSED_COACHING setting."""
+    if input_data.fusedCoaching is not None:
+        return input_data.fusedCoaching
+    return os.getenv("CLUBAPPLY_FUSED_COACHING", "0").lower() in {"1", "true", "yes", "on"}
+
+
+def stage_deadlines(budget: Optional[float], start: float) -> Dict[str, float]:
+    if not budget or budget <= 0:
+        return {}
+    return {name: start + budget * share for name, share in BUDGET_SPLIT.items()}
+
+
+def build_stages(input_data: InputSpec) -> List[Stage]:
+    """Declare the pipeline as a dependency graph keyed by stage name.
+
+    Scraping and the resume read only need the input spec, the summarizer
+    needs both sets of findings, and the three coaches only need the brief
+    (plus the resume text for the tailor), so they all fan out in parallel.
+    Each agent stage also declares the exact inputs its output depends on,
+    which is what the stage cache keys on, and its heuristic fallback for
+    when it runs out of latency budget.
+
+    In fused mode a ``coaching`` stage produces all three coaching sections
+    in one LLM call; each coach stage takes its section from it and only runs
+    its own agent when that section is missing or invalid.
+    """
+    timed_out = "Exceeded its latency budget; showing heuristic results."
+    fused = fused_coaching(input_data)
+    coach_deps = ["coaching"] if fused else []
+
+    async def _instagram() -> InstagramFindings:
+        return await instagram_agent.run(input_data.instagramUrl, is_online=input_data.isOnline)
+
+    async def _website() -> WebsiteFindings:
+        return await website_agent.run(input_data.websiteUrl, is_online=input_data.isOnline)
+
+    async def _resume_text() -> str:
+        return await asyncio.to_thread(read_pdf_text_cached, input_data.resumePath, max_pages=3)
+
+    async def _brief(ig: InstagramFindings, web: WebsiteFindings) -> ClubBrief:
+        return await summarizer_agent.run((ig, web))
+
+    async def _coaching(brief: ClubBrief, resume_text: str) -> Dict[str, Any]:
+        return await fused_coach.run(
+            brief,
+            resume_text,
+            input_data.applicationQuestions,
+            input_data.clubName,
+            input_data.schoolName,
+        )
+
+    def _section(coaching: Optional[Dict[str, Any]], name: str, model: type) -> Optional[Any]:
+        part = (coaching or {}).get(name)
+        return model(**part) if part else None
+
+    async def _resume(brief: ClubBrief, resume_text: str, coaching: Optional[Dict[str, Any]] = None) -> ResumeSuggestions:
+        section = _section(coaching, "resume", ResumeSuggestions)
+        if section is not None:
+            return section
+        return await resume_tailor.run(
+            brief,
+            input_data.resumePath,
+            input_data.clubName,
+            input_data.schoolName,
+            resume_text=resume_text,
+        )
+
+    async def _application(brief: ClubBrief, coaching: Optional[Dict[str, Any]] = None) -> ApplicationSuggestions:
+        section = _section(coaching, "application", ApplicationSuggestions)
+        if section is not None:
+            return section
+        return await application_coach.run(brief, input_data.applicationQuestions)
+
+    async def _interview(brief: ClubBrief, coaching: Optional[Dict[str, Any]] = None) -> InterviewPrep:
+        section = _section(coaching, "interview", InterviewPrep)
+        if section is not None:
+            return section
+        return await interview_coach.run(brief)
+
+    stages = [
+        Stage(
+            "instagram",
+            _instagram,
+            cache_key=lambda: [input_data.instagramUrl, input_data.isOnline],
+            model=InstagramFindings,
+            fallback=lambda: instagram_agent.heuristic(warnings=[f"Instagram: {timed_out}"]),
+        ),
+        Stage(
+            "website",
+            _website,
+            cache_key=lambda: [input_data.websiteUrl, input_data.isOnline],
+            model=WebsiteFindings,
+            fallback=lambda: website_agent.heuristic(warnings=[f"Website: {timed_out}"]),
+        ),
+        Stage("resume_text", _resume_text, fallback=lambda: ""),
+        Stage(
+            "brief",
+            _brief,
+            deps=["instagram", "website"],
+            cache_key=lambda ig, web: [model_to_dict(ig), model_to_dict(web)],
+            model=ClubBrief,
+            fallback=summarizer_agent.heuristic,
+        ),
+        # The coach stages key only on their own inputs, so fused and
+        # separate runs share cached sections.
+        Stage(
+            "resume",
+            _resume,
+            deps=["brief", "resume_text", *coach_deps],
+            cache_key=lambda brief, resume_text, *_: [
+                model_to_dict(brief),
+                stable_hash(resume_text),
+                input_data.clubName,
+                input_data.schoolName,
+            ],
+            model=ResumeSuggestions,
+            fallback=lambda brief, resume_text, *_: resume_tailor.heuristic(brief),
+        ),
+        Stage(
+            "application",
+            _application,
+            deps=["brief", *coach_deps],
+            cache_key=lambda brief, *_: [model_to_dict(brief), input_data.applicationQuestions],
+            model=ApplicationSuggestions,
+            fallback=lambda brief, *_: application_coach.heuristic(brief, input_data.applicationQuestions),
+        ),
+        Stage(
+            "interview",
+            _interview,
+            deps=["brief", *coach_deps],
+            cache_key=lambda brief, *_: [model_to_dict(brief)],
+            model=InterviewPrep,
+            fallback=lambda brief, *_: interview_coach.heuristic(brief),
+        ),
+    ]
+    if fused:
+        stages.append(
+            Stage(
+                "coaching",
+                _coaching,
+                deps=["brief", "resume_text"],
+                cache_key=lambda brief, resume_text: [
+                    model_to_dict(brief),
+                    stable_hash(resume_text),
+                    input_data.applicationQuestions,
+                    input_data.clubName,
+                    input_data.schoolName,
+                ],
+                # Out of budget: every coach stage falls back on its own
+                fallback=lambda brief, resume_text: {},
+            )
+        )
+    return stages
+
+
+def _stream_stage(stage: Stage, on_partial: PartialCallback) -> None:
+    """Make ``stage`` stream its LLM calls, forwarding fields to ``on_partial``."""
+    fn = stage.fn
+
+    async def _run(*args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+
+        def _handler(event: PartialEvent) -> None:
+            # Called from the LLM worker thread
+            loop.call_soon_threadsafe(lambda: asyncio.ensure_future(on_partial(stage.name, event)))
+
+        with stream_partials(_handler):
+            return await fn(*args)
+
+    stage.fn = _run
+
+
+async def run_clubapply(
+    input_data: InputSpec,
+    on_stage: Optional[StageCallback] = None,
+    on_partial: Optional[PartialCallback] = None,
+) -> FinalReport:
+    """Run the full pipeline and assemble the FinalReport.
+
+    If ``on_stage`` is given it is awaited with ``(stage_name, section)`` as
+    soon as each report section is ready, e.g. to stream partial results.
+    With ``on_partial``, LLM replies are streamed and it is awaited with
+    ``(stage_name, PartialEvent)`` for each field or list item as it is
+    generated, before the stage's section is complete.
+    With a latency budget, stages still running at their share of it switch to
+    their heuristic fallback and are listed in ``degraded_stages``.
+    """
+
+    async def _forward(name: str, result) -> None:
+        if on_stage is not None and name in REPORT_STAGES:
+            await on_stage(name, result)
+
+    budget = latency_budget(input_data)
+    deadlines = stage_deadlines(budget, asyncio.get_running_loop().time())
+    print(f"[Orchestrator] Launching stage graph budget={budget or 'none'}")
+    stages = build_stages(input_data)
+    if on_partial is not None:
+        for stage in stages:
+            _stream_stage(stage, on_partial)
+    with collect_spans() as spans:
+        results = await run_stage_graph(
+            stages,
+            on_result=_forward,
+            cache=get_stage_cache(),
+            deadlines=deadlines,
+        )
 
     ts = datetime.utcnow().isoformat()
     report = FinalReport(
         input=input_data,
-        instagram=ig_res,
-        website=web_res,
-        brief=summary,
-        resume=resume,
-        application=application,
-        interview=interview,
+        instagram=results["instagram"],
+        website=results["website"],
+        brief=results["brief"],
+        resume=results["resume"],
+        application=results["application"],
+        interview=results["interview"],
         timestamp=ts,
+        cached_stages=results.cached,
+        degraded_stages=results.degraded,
+        trace=list(spans) if input_data.includeTrace else None,
     )
     print("[Orchestrator] Aggregation complete, returning FinalReport")
     return report
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import List, Optional, Any
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import List, Optional, Any, Callable, Dict, Tuple
+from pydantic import BaseModel, Field, ValidationError
 
 
 class InputSpec(BaseModel):
@@ -17,6 +18,19 @@ class InputSpec(BaseModel):
         default=True,
         description="If True, fetch live content (Instagram/Website). If False, run heuristics only.",
     )
+    latencyBudgetSec: Optional[float] = Field(
+        default=None,
+        description="End-to-end latency budget in seconds; late stages fall back to heuristics.",
+    )
+    includeTrace: bool = Field(
+        default=False,
+        description="If True, attach per-stage tracing spans to the FinalReport.",
+    )
+    fusedCoaching: Optional[bool] = Field(
+        default=None,
+        description="If True, produce resume/application/interview coaching in one LLM call "
+        "(default: CLUBAPPLY_FUSED_COACHING).",
+    )
 
 
 class InstagramFindings(BaseModel):
@@ -73,6 +87,13 @@ class InterviewPrep(BaseModel):
     links: List[str]
 
 
+class SpanRecord(BaseModel):
+    name: str
+    start: float = Field(..., description="Unix timestamp (seconds) when the span started")
+    duration_ms: float
+    attrs: Dict[str, Any] = {}
+
+
 class FinalReport(BaseModel):
     input: InputSpec
     instagram: InstagramFindings
@@ -83,6 +104,13 @@ class FinalReport(BaseModel):
     interview: InterviewPrep
     version: str = Field(default="0.1.0")
     timestamp: Optional[str] = None
+    cached_stages: List[str] = Field(
+        default_factory=list, description="Stages served from the stage cache instead of re-run"
+    )
+    degraded_stages: List[str] = Field(
+        default_factory=list, description="Stages that hit their deadline and used heuristic output"
+    )
+    trace: Optional[List[SpanRecord]] = None
 
 
 def model_to_dict(model: Any) -> dict:
@@ -93,3 +121,41 @@ def model_to_dict(model: Any) -> dict:
         return model.model_dump()
     raise TypeError("Unsupported model type")
 
+
+
+@lru_cache(maxsize=None)
+def json_schema(model_cls: type) -> Dict[str, Any]:
+    # Support Pydantic v1 and v2
+    if hasattr(model_cls, "model_json_schema"):
+        return model_cls.model_json_schema()
+    return model_cls.schema()
+
+
+def salvage(
+    model_cls: type, data: Dict[str, Any], fallback: Callable[[], BaseModel]
+) -> Tuple[BaseModel, List[str]]:
+    """Build ``model_cls`` from ``data``, keeping every field that validates.
+
+    Fields that are missing or fail validation are taken from ``fallback()``
+    (only computed when needed). Returns the model and the replaced field
+    names; raises ValidationError if even the fallback values do not validate.
+    """
+    try:
+        return model_cls(**data), []
+    except ValidationError as e:
+        error = e
+    base = model_to_dict(fallback())
+    merged = {k: v for k, v in data.items() if k in base}
+    replaced: List[str] = []
+    while True:
+        bad = {str(err["loc"][0]) for err in error.errors() if err.get("loc")} - set(replaced)
+        bad &= set(base)
+        if not bad:
+            raise error
+        for name in sorted(bad):
+            merged[name] = base[name]
+            replaced.append(name)
+        try:
+            return model_cls(**merged), replaced
+        except ValidationError as e:
+            error = e
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import tempfile
 from typing import Optional, List, Dict, Any
 
-from fastapi import FastAPI, UploadFile, File
+from fastapi import FastAPI, UploadFile, File, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
 from ..schemas import (
@@ -18,7 +21,10 @@ from ..schemas import (
 )
 from ..agents import instagram_agent, website_agent, summarizer_agent, resume_tailor, application_coach, interview_coach
 from ..orchestrator import run_clubapply
-from ..agents.llm_utils import call_llm_json
+from ..batch import DEFAULT_CONCURRENCY, run_batch, result_to_line
+from ..agents.llm_utils import acall_llm_json, warm_clients
+from ..tracing import render_metrics
+from ..jobs import JobStore, start_workers, stop_workers
 
 
 app = FastAPI(title="ClubApply Strands API", version="0.1.0")
@@ -32,11 +38,48 @@ app.add_middleware(
 )
 
 
+_job_store: Optional[JobStore] = None
+_job_workers: List[Any] = []
+
+
+def get_job_store() -> JobStore:
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
+
+
+@app.on_event("startup")
+async def _warm_llm_clients():
+    # Build provider clients (credential resolution, connection pools) up front
+    await asyncio.to_thread(warm_clients)
+
+
+@app.on_event("startup")
+async def _start_job_workers():
+    # CLUBAPPLY_JOB_WORKERS=0 leaves execution to `python -m clubapply_strands.jobs`
+    count = int(os.getenv("CLUBAPPLY_JOB_WORKERS", "2"))
+    if count > 0:
+        _job_workers.extend(start_workers(count, get_job_store().db_path))
+
+
+@app.on_event("shutdown")
+async def _stop_job_workers():
+    stop_workers(_job_workers)
+    _job_workers.clear()
+
+
 @app.get("/health")
 async def health():
     return {"ok": True}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus exposition of span histograms and outcome counters."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/upload/resume")
 async def upload_resume(file: UploadFile = File(...)):
     suffix = os.path.splitext(file.filename)[1] or ".pdf"
@@ -89,7 +132,7 @@ async def summarizer(req: SummarizerReq):
             "Summarize the content into: {overview, mission_values[], what_they_look_for[], "
             "sample_events[], keywords[], what_matters_most[5]} as JSON."
         )
-        data = call_llm_json(system, req.content)
+        data = await acall_llm_json(system, req.content)
         if data:
             try:
                 return ClubBrief(**data).dict()
@@ -253,3 +296,91 @@ async def application_coach_ep(req: ApplicationCoachReq):
 async def clubapply_run(spec: InputSpec):
     report = await run_clubapply(spec)
     return model_to_dict(report)
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/clubapply/run/stream")
+async def clubapply_run_stream(spec: InputSpec):
+    """Server-Sent Events variant of /clubapply/run.
+
+    Emits one event per report section, named after its schema
+    (InstagramFindings, WebsiteFindings, ClubBrief, ResumeSuggestions,
+    ApplicationSuggestions, InterviewPrep) as soon as it is ready, then a
+    final FinalReport event. Failures are reported as an ``error`` event.
+    While a section is still being generated, ``partial`` events carry each
+    completed field (or list item, with its ``index``) of the LLM reply.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _on_stage(name: str, section) -> None:
+        payload = {"stage": name, "data": model_to_dict(section)}
+        await queue.put(_sse_event(type(section).__name__, payload))
+
+    async def _on_partial(name: str, event) -> None:
+        payload = {"stage": name, "field": event.field, "index": event.index, "value": event.value}
+        await queue.put(_sse_event("partial", payload))
+
+    async def _run() -> None:
+        try:
+            report = await run_clubapply(spec, on_stage=_on_stage, on_partial=_on_partial)
+            await queue.put(_sse_event("FinalReport", model_to_dict(report)))
+        except Exception as e:
+            await queue.put(_sse_event("error", {"error": str(e)}))
+        finally:
+            await queue.put(None)
+
+    async def _events():
+        task = asyncio.create_task(_run())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield item
+        finally:
+            # Client went away: stop the pipeline instead of finishing unseen
+            task.cancel()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class BatchReq(BaseModel):
+    specs: List[InputSpec]
+    concurrency: Optional[int] = DEFAULT_CONCURRENCY
+
+
+@app.post("/clubapply/batch")
+async def clubapply_batch(req: BatchReq):
+    """Run many specs in one request; streams one NDJSON line per spec as it completes."""
+
+    async def _lines():
+        async for idx, result in run_batch(req.specs, concurrency=req.concurrency or DEFAULT_CONCURRENCY):
+            yield result_to_line(req.specs[idx], result)
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs")
+async def submit_job(spec: InputSpec, idempotency_key: Optional[str] = Header(default=None)):
+    """Queue a full pipeline run; poll GET /jobs/{job_id} for progress and the report.
+
+    Resubmitting with the same ``Idempotency-Key`` header, or an identical spec
+    while the first is still queued/running, returns the existing job.
+    """
+    job, created = await asyncio.to_thread(get_job_store().submit, spec, idempotency_key)
+    return {"job_id": job["job_id"], "status": job["status"], "deduplicated": not created}
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(get_job_store().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
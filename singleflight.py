@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .tracing import annotate, counter
+
+
+_calls_total = counter(
+    "clubapply_singleflight_total", "Singleflight calls by group and role (leader ran it, follower shared it)."
+)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Group:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key (the leader) runs ``fn``; callers arriving
+    while it is in flight block until it finishes and receive the same
+    result or exception. Nothing is remembered once the call completes, so
+    this complements rather than replaces a result cache. Works across
+    threads, which covers async callers that run the work via to_thread or an
+    executor.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any], copy: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Run ``fn`` once per in-flight ``key``.
+
+        ``copy`` is applied to the shared result for every caller (leader
+        included), for results that callers are known to mutate.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            _calls_total.inc({"group": self.name, "role": "follower"})
+            annotate(coalesced=True)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _copied(call.result, copy)
+
+        _calls_total.inc({"group": self.name, "role": "leader"})
+        try:
+            call.result = fn()
+            return _copied(call.result, copy)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def ado(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        copy: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """Async variant of :meth:`do` for callers on the same event loop.
+
+        The leader's coroutine runs as a task that followers await through
+        :func:`asyncio.shield`, so one caller being cancelled (e.g. at a stage
+        deadline) does not cancel the work for the others.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            leader = task is None
+            if leader:
+                task = self._tasks[task_key] = loop.create_task(fn())
+                task.add_done_callback(lambda t: self._finish(task_key, t))
+
+        if leader:
+            _calls_total.inc({"group": self.name, "role": "leader"})
+        else:
+            _calls_total.inc({"group": self.name, "role": "follower"})
+            annotate(coalesced=True)
+        return _copied(await asyncio.shield(task), copy)
+
+    def _finish(self, task_key: Tuple[int, str], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        # Mark the error as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+
+def _copied(result: Any, copy: Optional[Callable[[Any], Any]]) -> Any:
+    return copy(result) if copy is not None and result is not None else result
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from pydantic import ValidationError
+
+from .cache import DiskCache, stable_hash
+from .schemas import json_schema, model_to_dict
+from .tracing import span
+
+
+StageCallback = Callable[[str, Any], Awaitable[None]]
+
+
+class Stage:
+    """A named pipeline step that runs once all of its dependencies resolve.
+
+    ``fn`` is awaited with the dependency results as positional arguments, in
+    the order they are listed in ``deps``.
+
+    A stage is memoizable when it has a ``cache_key``: called with the same
+    arguments as ``fn``, it returns JSON-serializable key material covering
+    every input the output depends on. ``model`` is the pydantic class used to
+    rebuild a cached result; its JSON schema is part of the key, and an entry
+    that no longer validates is dropped and recomputed.
+
+    ``fallback`` is a cheap synchronous stand-in taking the same arguments as
+    ``fn``; it is used when the stage misses its deadline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[Any]],
+        deps: Sequence[str] = (),
+        cache_key: Optional[Callable[..., Any]] = None,
+        model: Optional[type] = None,
+        fallback: Optional[Callable[..., Any]] = None,
+    ):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+        self.cache_key = cache_key
+        self.model = model
+        self.fallback = fallback
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, deps={self.deps!r})"
+
+
+def _check_graph(stages: Sequence[Stage]) -> None:
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate stage names: {names}")
+    known = set(names)
+    for s in stages:
+        missing = [d for d in s.deps if d not in known]
+        if missing:
+            raise ValueError(f"Stage {s.name!r} depends on unknown stages {missing}")
+
+    # Kahn's algorithm: every stage must become ready eventually
+    pending = {s.name: set(s.deps) for s in stages}
+    done: set = set()
+    while pending:
+        ready = [n for n, deps in pending.items() if deps <= done]
+        if not ready:
+            raise ValueError(f"Cycle detected among stages {sorted(pending)}")
+        for n in ready:
+            done.add(n)
+            del pending[n]
+
+
+class GraphResults(dict):
+    """Stage results by name, plus which stages were cached or degraded."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.cached: List[str] = []
+        self.degraded: List[str] = []
+
+
+async def run_stage_graph(
+    stages: Sequence[Stage],
+    on_result: Optional[StageCallback] = None,
+    cache: Optional[DiskCache] = None,
+    deadlines: Optional[Dict[str, float]] = None,
+) -> GraphResults:
+    """Run every stage as soon as its inputs are ready; return results by name.
+
+    Independent stages run concurrently, so total latency tracks the critical
+    path of the graph rather than the sum of all stages. If any stage raises,
+    the remaining stages are cancelled and the exception propagates.
+    ``on_result`` is awaited with ``(name, result)`` the moment each stage
+    finishes, before its dependents are released.
+
+    With a ``cache``, memoizable stages are looked up under a hash of their
+    inputs first, so a re-run only executes the stages whose inputs changed
+    (and everything downstream of them). Results produced by a heuristic
+    fallback or an error are never stored.
+
+    ``deadlines`` maps stage names to absolute event-loop times
+    (``loop.time()``). A stage with a ``fallback`` that is still running at its
+    deadline is cancelled and replaced by the fallback result.
+    """
+    _check_graph(stages)
+    loop = asyncio.get_running_loop()
+    tasks: Dict[str, asyncio.Task] = {}
+    cached: List[str] = []
+    degraded: List[str] = []
+
+    async def _call(stage: Stage, args: List[Any], attrs: Dict[str, Any]) -> Any:
+        deadline = (deadlines or {}).get(stage.name)
+        if deadline is None or stage.fallback is None:
+            return await stage.fn(*args)
+        try:
+            return await asyncio.wait_for(stage.fn(*args), timeout=max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            print(f"[StageGraph] deadline expired for {stage.name}; using heuristic fallback")
+            attrs["outcome"] = "deadline"
+            degraded.append(stage.name)
+            return stage.fallback(*args)
+
+    async def _run(stage: Stage) -> Any:
+        args: List[Any] = []
+        for dep in stage.deps:
+            args.append(await tasks[dep])
+        key = None
+        if cache is not None and stage.cache_key is not None:
+            material = stage.cache_key(*args)
+            if stage.model is not None:
+                # A changed result schema makes older entries unreachable
+                material = [material, json_schema(stage.model)]
+            key = stage.name + ":" + stable_hash(material)
+        with span("stage", stage=stage.name) as attrs:
+            hit = await asyncio.to_thread(cache.get, key) if key else None
+            if hit is not None and stage.model is not None:
+                try:
+                    hit = stage.model(**hit)
+                except ValidationError as e:
+                    print(f"[StageGraph] stale cache entry for {stage.name} ({len(e.errors())} errors); recomputing")
+                    await asyncio.to_thread(cache.delete, key)
+                    hit = None
+            if hit is not None:
+                print(f"[StageGraph] cache hit {stage.name}")
+                attrs["cached"] = True
+                cached.append(stage.name)
+                result = hit
+            else:
+                print(f"[StageGraph] start {stage.name}")
+                result = await _call(stage, args, attrs)
+                if key and attrs.get("outcome", "ok") == "ok":
+                    value = model_to_dict(result) if stage.model is not None else result
+                    await asyncio.to_thread(cache.set, key, value)
+        print(f"[StageGraph] done {stage.name}")
+        if on_result is not None:
+            await on_result(stage.name, result)
+        return result
+
+    for stage in stages:
+        tasks[stage.name] = asyncio.ensure_future(_run(stage))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for t in tasks.values():
+            t.cancel()
+        raise
+    results = GraphResults((name, t.result()) for name, t in tasks.items())
+    results.cached = [name for name in tasks if name in cached]
+    results.degraded = [name for name in tasks if name in degraded]
+    return results
+
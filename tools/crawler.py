@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from ..singleflight import Group
+from ..tracing import annotate, span
+from .fetch_url import get_session
+from .frontier import MAX_DEPTH, Frontier, sitemap_url, sitemap_urls
+from .html_extract import PageContent, extract
+from .dedup import dedupe_pages
+from .download import is_html
+from .http_cache import cached_get
+
+
+# Requests in flight per host, and an optional minimum gap between request
+# starts to the same host, so a crawl does not hammer small club sites
+HOST_CONCURRENCY = max(1, int(os.getenv("CRAWL_HOST_CONCURRENCY", "4")))
+HOST_DELAY = float(os.getenv("CRAWL_HOST_DELAY", "0"))
+# Whole-crawl budget; pages still pending when it runs out are dropped
+DEADLINE = float(os.getenv("CRAWL_DEADLINE", "20"))
+PAGE_TIMEOUT = float(os.getenv("CRAWL_PAGE_TIMEOUT", "10"))
+MAX_ATTEMPTS = max(1, int(os.getenv("CRAWL_MAX_ATTEMPTS", "3")))
+BACKOFF_BASE = 0.25
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Seed the frontier from /sitemap.xml, waiting at most SITEMAP_WAIT seconds
+# for it once the root page is in
+SITEMAP = os.getenv("CRAWL_SITEMAP", "1").lower() not in {"0", "false", "no", "off"}
+SITEMAP_WAIT = float(os.getenv("CRAWL_SITEMAP_WAIT", "2"))
+# Drop header/nav/footer text repeated across pages and near-duplicate paragraphs
+DEDUP = os.getenv("CRAWL_DEDUP", "1").lower() not in {"0", "false", "no", "off"}
+
+_crawl_flight = Group("acrawl_website")
+
+
+class _Host:
+    """Per-host concurrency slots plus politeness spacing between requests."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.slots = asyncio.Semaphore(HOST_CONCURRENCY)
+        self.lock = asyncio.Lock()
+        self.next_start = 0.0
+
+    async def wait_turn(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + HOST_DELAY
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Shared by every crawl on an event loop (server requests, batch runs), so
+# concurrent crawls of one site respect the same limits. Keyed by loop like
+# singleflight's async calls, since the semaphore and lock belong to one loop.
+_hosts: Dict[Tuple[int, str], _Host] = {}
+_hosts_lock = threading.Lock()
+
+
+def _host(url: str) -> _Host:
+    loop = asyncio.get_running_loop()
+    key = (id(loop), urlsplit(url).netloc.lower())
+    with _hosts_lock:
+        host = _hosts.get(key)
+        # A closed loop's id can be reused by a new one (asyncio.run per crawl)
+        if host is None or host.loop is not loop:
+            host = _hosts[key] = _Host(loop)
+    return host
+
+
+class _Retryable(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    try:
+        return float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def _get(url: str, timeout: float) -> requests.Response:
+    """One cached GET over the pooled session; raises _Retryable for transient failures."""
+    with span("fetch", url=url) as attrs:
+        try:
+            resp = cached_get(get_session(), url, timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            attrs["outcome"] = "error"
+            raise _Retryable(str(e)) from e
+        attrs["status"] = resp.status_code
+        attrs["bytes"] = len(resp.content)
+        if resp.status_code in RETRY_STATUS:
+            attrs["outcome"] = "error"
+            raise _Retryable(f"HTTP {resp.status_code}", _retry_after(resp))
+        if resp.status_code >= 400:
+            attrs["outcome"] = "error"
+        resp.raise_for_status()
+        return resp
+
+
+def _content(resp: requests.Response, url: str) -> PageContent:
+    """Parse HTML pages; plain text (e.g. a PDF's extracted text) is used as is."""
+    if is_html(resp):
+        return extract(resp.text, url)
+    return PageContent(resp.text.strip(), [], None, None, {}, [], {})
+
+
+class Crawler:
+    """Crawl of one site, fetching the best-ranked frontier pages concurrently.
+
+    Fetches run on worker threads over the shared keep-alive ``Session`` from
+    :func:`get_session`; scheduling, retries and the overall deadline are
+    handled on the event loop, and per-host limits are shared with every
+    other crawl on that loop.
+    """
+
+    def __init__(self, max_pages: int = 5, deadline: Optional[float] = None, max_depth: int = MAX_DEPTH):
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.deadline = DEADLINE if deadline is None else deadline
+        self._stop_at = 0.0
+
+    def _remaining(self) -> float:
+        return self._stop_at - time.monotonic()
+
+    async def fetch(self, url: str, quiet: bool = False) -> Optional[requests.Response]:
+        """GET ``url`` with bounded, jittered retries; None on failure or deadline."""
+        host = _host(url)
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            remaining = self._remaining()
+            if remaining <= 0:
+                return None
+            async with host.slots:
+                await host.wait_turn()
+                try:
+                    return await asyncio.to_thread(_get, url, min(PAGE_TIMEOUT, max(0.5, self._remaining())))
+                except _Retryable as e:
+                    if attempt == MAX_ATTEMPTS:
+                        print(f"[crawl] giving up on {url} after {attempt} attempts: {e}")
+                        return None
+                    delay = e.retry_after or BACKOFF_BASE * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                    print(f"[crawl] retrying {url} in {delay:.2f}s: {e}")
+                except Exception as e:
+                    if not quiet:
+                        print(f"[crawl] ERROR {url}: {e}")
+                    return None
+            # Back off outside the host slot so other pages can proceed
+            await asyncio.sleep(min(delay, max(0.0, self._remaining())))
+        return None
+
+    async def _page(self, url: str) -> Optional[PageContent]:
+        resp = await self.fetch(url)
+        if resp is None:
+            return None
+        return await asyncio.to_thread(_content, resp, url)
+
+    async def _sitemap(self, root_url: str) -> List[str]:
+        """Page URLs from /sitemap.xml (and up to two child sitemaps of an index)."""
+        resp = await self.fetch(sitemap_url(root_url), quiet=True)
+        pages, children = sitemap_urls(resp.text if resp is not None else "")
+        for child in children[:2]:
+            resp = await self.fetch(child, quiet=True)
+            pages.extend(sitemap_urls(resp.text if resp is not None else "")[0])
+        if pages:
+            print(f"[crawl] sitemap listed {len(pages)} pages")
+        return pages
+
+    async def crawl(self, root_url: str) -> Tuple[str, List[str]]:
+        self._stop_at = time.monotonic() + self.deadline
+        print(f"[crawl] root={root_url} max_pages={self.max_pages} depth={self.max_depth} deadline={self.deadline:.0f}s")
+        sitemap = asyncio.ensure_future(self._sitemap(root_url)) if SITEMAP else None
+        root = await self._page(root_url) or extract("")
+
+        frontier = Frontier(root_url, self.max_depth)
+        for link in root.links:
+            frontier.add(link, root.anchors.get(link, ""), depth=1)
+        if sitemap is not None:
+            # Sitemap pages rank on their path alone; don't hold the crawl up for long
+            try:
+                seeds = await asyncio.wait_for(sitemap, timeout=max(0.0, min(SITEMAP_WAIT, self._remaining())))
+            except asyncio.TimeoutError:
+                seeds = []
+            for url in seeds:
+                frontier.add(url, depth=1)
+
+        # Keep max_pages - 1 fetches in flight, always taking the best-scored
+        # URL; a failed page frees its slot for the next one, and pages above
+        # the depth limit add their links to the frontier.
+        pages: Dict[str, str] = {}
+        launched: List[str] = []
+        pending: Dict[asyncio.Task, Tuple[str, int]] = {}
+        try:
+            while True:
+                while len(pending) + len(pages) < self.max_pages - 1:
+                    nxt = frontier.pop()
+                    if nxt is None:
+                        break
+                    link, depth = nxt
+                    print(f"[crawl] visiting {link} (depth {depth})")
+                    launched.append(link)
+                    pending[asyncio.ensure_future(self._page(link))] = (link, depth)
+                if not pending:
+                    break
+                done, _ = await asyncio.wait(
+                    pending, timeout=max(0.0, self._remaining()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    print(f"[crawl] deadline reached with {len(pending)} pages pending")
+                    annotate(crawl_deadline_hit=True)
+                    break
+                for task in done:
+                    link, depth = pending.pop(task)
+                    page = task.result()
+                    if page is None:
+                        continue
+                    pages[link] = page.text
+                    for child in page.links:
+                        frontier.add(child, page.anchors.get(child, ""), depth=depth + 1)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        visited = [root_url] + [link for link in launched if link in pages]
+        parts = [p for p in [root.text] + [pages[link] for link in visited[1:]] if p]
+        if DEDUP:
+            raw_chars = sum(len(p) for p in parts)
+            parts = dedupe_pages(parts)
+            kept_chars = sum(len(p) for p in parts)
+            if raw_chars:
+                print(f"[crawl] dedup kept {kept_chars}/{raw_chars} chars")
+                annotate(text_chars=raw_chars, deduped_chars=kept_chars)
+        combined_text = "\n\n".join(parts)
+        print(f"[crawl] visited={len(visited)} pages")
+        return combined_text, visited
+
+
+async def acrawl_website(root_url: str, max_pages: int = 5, deadline: Optional[float] = None) -> Tuple[str, List[str]]:
+    """
+    Crawl a site up to CRAWL_MAX_DEPTH link levels with concurrent fetches,
+    most relevant pages first; aggregate text content.
+    Returns (combined_text, visited_urls)
+    Concurrent crawls of the same site on one event loop share one crawl.
+    """
+    return await _crawl_flight.ado(
+        f"{root_url}|{max_pages}",
+        lambda: Crawler(max_pages, deadline).crawl(root_url),
+        copy=lambda res: (res[0], list(res[1])),
+    )
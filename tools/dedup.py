@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Set
+
+
+# Paragraphs sharing at least this share of word 3-grams with one already
+# kept (Jaccard, or containment of the newer one) count as near-duplicates
+SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.8"))
+SHINGLE_WORDS = 3
+# Shorter lines are only removed when they repeat exactly (nav labels etc.)
+MIN_NEAR_DUP_WORDS = 6
+
+_WORD = re.compile(r"\w+")
+
+
+def _shingles(words: List[str]) -> Set[int]:
+    return {hash(tuple(words[i : i + SHINGLE_WORDS])) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+class _NearDuplicates:
+    """Shingle sets of kept paragraphs with an inverted index for candidate lookup."""
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.sets: List[Set[int]] = []
+        self.postings: Dict[int, List[int]] = {}
+
+    def seen(self, shingles: Set[int]) -> bool:
+        shared: Counter = Counter()
+        for s in shingles:
+            for idx in self.postings.get(s, ()):
+                shared[idx] += 1
+        for idx, common in shared.items():
+            union = len(shingles) + len(self.sets[idx]) - common
+            if common / union >= self.threshold or common / len(shingles) >= self.threshold:
+                return True
+        return False
+
+    def add(self, shingles: Set[int]) -> None:
+        idx = len(self.sets)
+        self.sets.append(shingles)
+        for s in shingles:
+            self.postings.setdefault(s, []).append(idx)
+
+
+def dedupe_pages(pages: List[str], threshold: float = SIMILARITY) -> List[str]:
+    """Drop repeated and near-duplicate lines across (and within) pages.
+
+    Pages are line-per-block text as produced by ``html_extract``. A line
+    is kept only the first time it appears (compared case- and
+    punctuation-insensitively), so header/nav/footer text shared by every
+    page survives once, on the first page. Longer paragraphs are also
+    dropped when their word 3-grams mostly match a paragraph already kept.
+    Pages left empty are omitted.
+    """
+    exact: Set[str] = set()
+    near = _NearDuplicates(threshold)
+    out: List[str] = []
+    for page in pages:
+        kept: List[str] = []
+        for line in page.split("\n"):
+            words = _WORD.findall(line.lower())
+            key = " ".join(words)
+            if not key or key in exact:
+                continue
+            exact.add(key)
+            if len(words) >= MIN_NEAR_DUP_WORDS:
+                shingles = _shingles(words)
+                if near.seen(shingles):
+                    continue
+                near.add(shingles)
+            kept.append(line)
+        if kept:
+            out.append("\n".join(kept))
+    return out
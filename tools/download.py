@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import codecs
+import os
+import re
+import time
+from typing import Iterator, Mapping, Optional
+
+import requests
+
+from ..tracing import annotate
+from .pdf_reader import read_pdf_bytes
+
+
+# HTML (and text/XML, for sitemaps) bodies are read up to MAX_BYTES and
+# truncated beyond it; PDFs up to PDF_MAX_BYTES, else they are skipped.
+MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+PDF_MAX_BYTES = int(os.getenv("FETCH_PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("FETCH_PDF_MAX_PAGES", "10"))
+ERROR_BODY_BYTES = 64 * 1024
+CHUNK_SIZE = 64 * 1024
+SNIFF_BYTES = 4096
+
+TEXT_TYPES = {"text/html", "application/xhtml+xml", "text/plain", "text/xml", "application/xml"}
+PDF_TYPE = "application/pdf"
+
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_XML_ENCODING = re.compile(rb"^\s*<\?xml[^>]+encoding\s*=\s*[\"']([\w.:-]+)", re.IGNORECASE)
+# Per the HTML spec these labels are decoded as windows-1252
+_ALIASES = {"iso-8859-1": "cp1252", "latin-1": "cp1252", "latin1": "cp1252", "us-ascii": "cp1252", "ascii": "cp1252"}
+
+
+class UnsupportedContent(requests.RequestException):
+    """Response is of a type the pipeline cannot use; the body was not read."""
+
+
+class ContentTooLarge(requests.RequestException):
+    """Response exceeds the size cap for its type."""
+
+
+def media_type(headers: Mapping[str, str]) -> str:
+    return (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+
+
+def _valid(charset: Optional[str]) -> Optional[str]:
+    if not charset:
+        return None
+    charset = _ALIASES.get(charset.lower(), charset.lower())
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return None
+
+
+def sniff_charset(content_type: str, prefix: bytes) -> str:
+    """Encoding from a BOM, the Content-Type charset, a <meta> / XML declaration
+    in the first few KB, else UTF-8, without decoding the body."""
+    for bom, name in _BOMS:
+        if prefix.startswith(bom):
+            return name
+    m = _HEADER_CHARSET.search(content_type or "")
+    found = _valid(m.group(1)) if m else None
+    if found:
+        return found
+    head = prefix[:SNIFF_BYTES]
+    for pattern in (_META_CHARSET, _XML_ENCODING):
+        m = pattern.search(head)
+        found = _valid(m.group(1).decode("ascii", "ignore")) if m else None
+        if found:
+            return found
+    return "utf-8"
+
+
+def _chunks(resp: requests.Response) -> Iterator[bytes]:
+    read1 = getattr(resp.raw, "read1", None)
+    if read1 is None:  # urllib3 < 2
+        yield from resp.iter_content(CHUNK_SIZE)
+        return
+    # read1 returns whatever has arrived instead of waiting for a full chunk,
+    # so a slowly dripping body cannot stall between deadline checks
+    while True:
+        chunk = read1(CHUNK_SIZE, decode_content=True)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read(resp: requests.Response, limit: int, deadline: float) -> tuple:
+    """Up to ``limit`` decoded body bytes and whether the body was cut off.
+
+    ``timeout`` on a streamed request bounds each socket read, not the whole
+    transfer; raises ``requests.Timeout`` once ``deadline`` (monotonic) passes.
+    """
+    buf = bytearray()
+    for chunk in _chunks(resp):
+        buf += chunk
+        if len(buf) > limit:
+            return bytes(buf[:limit]), True
+        if time.monotonic() > deadline:
+            raise requests.Timeout(f"body of {resp.url} still arriving after the timeout ({len(buf)} bytes)")
+    return bytes(buf), False
+
+
+def get(
+    session: requests.Session,
+    url: str,
+    timeout: float,
+    headers: Optional[Mapping[str, str]] = None,
+) -> requests.Response:
+    """Streaming GET with type and size checks before the body is buffered.
+
+    HTML/text bodies are capped at MAX_BYTES (longer ones are truncated and
+    flagged with ``resp.truncated``), PDFs are converted to text by the PDF
+    reader, and other types are rejected from their headers alone. The whole
+    transfer must finish within ``timeout``. The returned response has its
+    body loaded and its encoding sniffed, so ``.text`` works as usual.
+    """
+    deadline = time.monotonic() + timeout
+    resp = session.get(url, timeout=timeout, headers=headers, stream=True)
+    resp.truncated = False
+    try:
+        if resp.status_code != 200:
+            resp._content = _read(resp, ERROR_BODY_BYTES, deadline)[0]
+            resp._content_consumed = True
+            resp.encoding = sniff_charset(resp.headers.get("Content-Type", ""), resp._content)
+            return resp
+
+        mime = media_type(resp.headers)
+        annotate(content_type=mime or "unknown")
+        if mime and mime not in TEXT_TYPES and mime != PDF_TYPE:
+            raise UnsupportedContent(f"unsupported content type {mime} for {url}")
+        cap = PDF_MAX_BYTES if mime == PDF_TYPE else MAX_BYTES
+        try:
+            declared = int(resp.headers.get("Content-Length", ""))
+        except ValueError:
+            declared = None
+        if mime == PDF_TYPE and declared is not None and declared > cap:
+            raise ContentTooLarge(f"{url} is {declared} bytes (cap {cap})")
+
+        body, truncated = _read(resp, cap, deadline)
+        if mime == PDF_TYPE:
+            if truncated:
+                raise ContentTooLarge(f"{url} exceeds {cap} bytes")
+            # Hand back the PDF's text as a plain-text page
+            text = read_pdf_bytes(body, max_pages=PDF_MAX_PAGES)
+            if text.startswith("PDF_READ_ERROR"):
+                raise UnsupportedContent(f"unreadable PDF at {url}: {text}")
+            resp.headers["Content-Type"] = "text/plain; charset=utf-8"
+            resp.headers.pop("Content-Length", None)
+            resp._content = text.encode("utf-8")
+            resp._content_consumed = True
+            resp.encoding = "utf-8"
+            annotate(pdf=True)
+            return resp
+        if truncated:
+            print(f"[fetch_url] truncated {url} at {cap} bytes")
+            annotate(truncated=True)
+            resp.truncated = True
+        resp._content = body
+        resp._content_consumed = True
+        resp.encoding = sniff_charset(resp.headers.get("Content-Type", ""), body)
+        return resp
+    finally:
+        resp.close()
+
+
+def is_html(resp: requests.Response) -> bool:
+    return media_type(resp.headers) in ("", "text/html", "application/xhtml+xml")
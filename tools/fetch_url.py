@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import re
 from typing import List, Tuple, Optional
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from ..singleflight import Group
+from ..tracing import span
+from .html_extract import extract
+from .http_cache import cached_get
 
 
 DEFAULT_HEADERS = {
@@ -16,16 +22,45 @@ DEFAULT_HEADERS = {
 }
 
 
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Process-wide Session so repeated fetches reuse keep-alive connections."""
+    global _session
+    if _session is None:
+        s = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        s.mount("http://", adapter)
+        s.mount("https://", adapter)
+        s.headers.update(DEFAULT_HEADERS)
+        _session = s
+    return _session
+
+
+_fetch_flight = Group("fetch_html")
+_crawl_flight = Group("crawl_website")
+
+
 def fetch_html(url: str, timeout: int = 15) -> str:
+    """GET a page as text; concurrent requests for the same URL share one fetch."""
+    return _fetch_flight.do(url, lambda: _fetch_html(url, timeout))
+
+
+def _fetch_html(url: str, timeout: int = 15) -> str:
     print(f"[fetch_url] GET {url} (timeout={timeout}s)")
-    try:
-        resp = requests.get(url, headers=DEFAULT_HEADERS, timeout=timeout)
-        resp.raise_for_status()
-        print(f"[fetch_url] OK {url} status={resp.status_code} len={len(resp.text)}")
-        return resp.text
-    except Exception as e:
-        print(f"[fetch_url] ERROR {url}: {e}")
-        return f"""<!-- FETCH_ERROR: {e} -->"""
+    with span("fetch", url=url) as attrs:
+        try:
+            resp = cached_get(get_session(), url, timeout)
+            attrs["status"] = resp.status_code
+            resp.raise_for_status()
+            print(f"[fetch_url] OK {url} status={resp.status_code} len={len(resp.text)}")
+            attrs["bytes"] = len(resp.content)
+            return resp.text
+        except Exception as e:
+            print(f"[fetch_url] ERROR {url}: {e}")
+            attrs["outcome"] = "error"
+            return f"""<!-- FETCH_ERROR: {e} -->"""
 
 
 def absolute_url(base_url: str, href: str) -> str:
@@ -46,59 +81,24 @@ def absolute_url(base_url: str, href: str) -> str:
 
 
 def extract_visible_text(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style", "noscript"]):
-        tag.extract()
-    text = soup.get_text(" \n ")
-    # Normalize whitespace
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    return extract(html).text
 
 
 def extract_links(html: str, base_url: str) -> List[str]:
-    soup = BeautifulSoup(html, "html.parser")
-    links: List[str] = []
-    for a in soup.find_all("a", href=True):
-        href = a.get("href")
-        if not href:
-            continue
-        href_abs = absolute_url(base_url, href)
-        links.append(href_abs)
-    return links
+    return extract(html, base_url).links
 
 
 def crawl_website(root_url: str, max_pages: int = 5) -> Tuple[str, List[str]]:
     """
-    Crawl a site up to ~1 depth, aggregate text content.
+    Crawl a site up to ~2 link levels, aggregate text content.
     Returns (combined_text, visited_urls)
+    Blocking wrapper around :class:`tools.crawler.Crawler` for sync callers;
+    concurrent crawls of the same site share one in-flight crawl.
     """
-    visited: List[str] = []
-    combined_text_parts: List[str] = []
-
-    print(f"[crawl] root={root_url} max_pages={max_pages}")
-    root_html = fetch_html(root_url)
-    visited.append(root_url)
-    combined_text_parts.append(extract_visible_text(root_html))
-    links = extract_links(root_html, root_url)
-
-    # Filter to same domain simple heuristic
-    domain_match = None
-    m = re.match(r"^(https?://[^/]+)", root_url)
-    if m:
-        domain_match = m.group(1)
-
-    for link in links:
-        if len(visited) >= max_pages:
-            break
-        if domain_match and not link.startswith(domain_match):
-            continue
-        if link in visited:
-            continue
-        print(f"[crawl] visiting {link}")
-        html = fetch_html(link)
-        visited.append(link)
-        combined_text_parts.append(extract_visible_text(html))
-
-    combined_text = "\n\n".join([p for p in combined_text_parts if p])
-    print(f"[crawl] visited={len(visited)} pages")
-    return combined_text, visited
+    from .crawler import Crawler
+
+    return _crawl_flight.do(
+        f"{root_url}|{max_pages}",
+        lambda: asyncio.run(Crawler(max_pages).crawl(root_url)),
+        copy=lambda res: (res[0], list(res[1])),
+    )
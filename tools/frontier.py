@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import heapq
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+
+# Pages linked from the root are depth 1; their links are depth 2
+MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "2"))
+SITEMAP_LIMIT = 500
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "ref", "ref_src", "source",
+    "_ga", "_gl", "hsctatracking", "si",
+}
+TRACKING_PREFIXES = ("utm_", "_hs", "pk_", "mtm_")
+
+SKIP_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".bmp", ".tif", ".tiff", ".heic",
+    ".mp4", ".mov", ".avi", ".webm", ".mp3", ".wav", ".m4a", ".zip", ".gz", ".tar", ".rar", ".7z",
+    ".dmg", ".exe", ".apk", ".css", ".js", ".mjs", ".json", ".xml", ".rss", ".atom", ".ics",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx",
+}
+
+# Words in a link's path or anchor text that point at what the brief needs
+KEYWORDS = {
+    "join": 6.0, "apply": 6.0, "application": 5.0, "recruit": 6.0, "membership": 5.0, "member": 3.0,
+    "involved": 5.0, "about": 5.0, "mission": 5.0, "values": 3.0, "who-we-are": 4.0,
+    "event": 4.0, "calendar": 2.0, "workshop": 3.0, "info-session": 4.0,
+    "board": 4.0, "officer": 4.0, "team": 3.0, "leadership": 3.0, "exec": 3.0, "people": 2.0,
+    "project": 2.5, "program": 2.5, "faq": 3.0, "contact": 1.0,
+}
+# ...and ones that rarely do
+PENALTIES = {
+    "login": 5.0, "signin": 5.0, "signup": 2.0, "logout": 5.0, "cart": 5.0, "checkout": 5.0,
+    "privacy": 4.0, "terms": 4.0, "cookie": 4.0, "accessibility": 3.0, "/tag/": 3.0, "/category/": 2.0,
+    "/author/": 3.0, "/feed": 4.0, "/search": 3.0, "wp-admin": 5.0, "wp-login": 5.0, "/page/": 2.0,
+    "share": 3.0,
+}
+ANCHOR_WEIGHT = 0.7
+PDF_PENALTY = 3.0
+
+
+def _same_site(host: str, root_host: str) -> bool:
+    return host.removeprefix("www.") == root_host.removeprefix("www.")
+
+
+def canonicalize(url: str, base: str = "") -> Optional[str]:
+    """Absolute http(s) URL with lowercase host, no default port, no fragment,
+    no tracking parameters and a sorted query; None for other schemes."""
+    parts = urlsplit(urljoin(base, url.strip()) if base else url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        return None
+    host = parts.hostname.lower()
+    if parts.port and not (scheme == "http" and parts.port == 80 or scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    query = [
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ""))
+
+
+def url_key(url: str) -> str:
+    """Dedup key for a canonical URL: ``/about`` and ``/about/``, and
+    http/https or www variants of the same page, are one page."""
+    parts = urlsplit(url)
+    path = parts.path.rstrip("/") or "/"
+    path = re.sub(r"/index\.(html?|php)$", "", path) or "/"
+    return urlunsplit(("", (parts.hostname or "").removeprefix("www."), path, parts.query, ""))
+
+
+def is_binary(url: str) -> bool:
+    path = urlsplit(url).path.lower()
+    dot = path.rfind(".")
+    return dot > path.rfind("/") and path[dot:] in SKIP_EXTENSIONS
+
+
+def score(url: str, anchor: str = "", depth: int = 1) -> float:
+    """Higher for links that look like about/mission/join/events/board pages."""
+    parts = urlsplit(url)
+    path = parts.path.lower()
+    anchor = anchor.lower()
+    total = 0.0
+    for word, weight in KEYWORDS.items():
+        if word in path:
+            total += weight
+        elif word in anchor:
+            total += weight * ANCHOR_WEIGHT
+    for word, weight in PENALTIES.items():
+        if word in path or word.strip("/") in anchor.split():
+            total -= weight
+    segments = [s for s in path.split("/") if s]
+    total -= 0.25 * len(segments) + 1.5 * (depth - 1)
+    if parts.query:
+        total -= 1.0
+    if path.endswith(".pdf"):
+        # Fetched and read as text, but slower and usually less useful than a page
+        total -= PDF_PENALTY
+    return total
+
+
+class Frontier:
+    """Priority queue of same-site URLs still to crawl, best score first."""
+
+    def __init__(self, root_url: str, max_depth: int = MAX_DEPTH):
+        self.root = canonicalize(root_url) or root_url
+        self.root_host = (urlsplit(self.root).hostname or "").lower()
+        self.max_depth = max_depth
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seen: Dict[str, str] = {url_key(self.root): self.root}
+        self._seq = 0
+
+    def add(self, url: str, anchor: str = "", depth: int = 1, bonus: float = 0.0) -> bool:
+        """Queue ``url`` unless it is off-site, binary, too deep or already seen."""
+        if depth > self.max_depth:
+            return False
+        canonical = canonicalize(url)
+        if canonical is None or is_binary(canonical):
+            return False
+        if not _same_site((urlsplit(canonical).hostname or "").lower(), self.root_host):
+            return False
+        key = url_key(canonical)
+        if key in self._seen:
+            return False
+        self._seen[key] = canonical
+        self._seq += 1
+        heapq.heappush(self._heap, (-(score(canonical, anchor, depth) + bonus), self._seq, canonical, depth))
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """Best remaining ``(url, depth)``, or None when empty."""
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+_LOC = re.compile(r"<loc>\s*(.*?)\s*</loc>", re.IGNORECASE | re.DOTALL)
+
+
+def sitemap_urls(xml: str, limit: int = SITEMAP_LIMIT) -> Tuple[List[str], List[str]]:
+    """``(page_urls, child_sitemaps)`` listed in a sitemap or sitemap index.
+
+    Gzipped child sitemaps (``.xml.gz``) are skipped: the download path only
+    accepts text bodies.
+    """
+    pages: List[str] = []
+    children: List[str] = []
+    for loc in _LOC.findall(xml or "")[: limit * 2]:
+        loc = loc.replace("&amp;", "&")
+        path = loc.lower().split("?")[0]
+        if path.endswith(".gz"):
+            continue
+        if path.endswith(".xml"):
+            children.append(loc)
+        elif len(pages) < limit:
+            pages.append(loc)
+    return pages, children
+
+
+def sitemap_url(root_url: str) -> str:
+    parts = urlsplit(root_url)
+    return urlunsplit((parts.scheme, parts.netloc, "/sitemap.xml", "", ""))
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+try:  # optional fast backend
+    import lxml.html
+    from lxml import etree
+except Exception:  # pragma: no cover - optional dependency
+    lxml = None  # type: ignore
+    etree = None  # type: ignore
+
+
+class PageContent(NamedTuple):
+    """Everything the agents use from one HTML document, from a single parse."""
+
+    text: str
+    links: List[str]
+    title: Optional[str] = None
+    description: Optional[str] = None
+    og: Dict[str, str] = {}
+    json_ld: List[Any] = []
+    # link -> its first non-empty anchor text (or image alt / title)
+    anchors: Dict[str, str] = {}
+
+
+# Elements whose content is never visible text
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+# Elements that start a new line in the extracted text
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "details", "dialog", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "li", "main", "nav", "ol", "p", "pre", "section", "summary", "table", "td", "th", "title",
+    "tr", "ul",
+}
+
+_INLINE_SPACE = re.compile(r"[^\S\n]+")
+
+
+def _clean_text(raw: str) -> str:
+    """Collapse whitespace within lines and drop empty lines; block boundaries stay newlines."""
+    lines = (_INLINE_SPACE.sub(" ", line).strip() for line in raw.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _http_link(base: str, href: Optional[str]) -> Optional[str]:
+    href = (href or "").strip()
+    if not href or href.startswith(("#", "javascript:", "mailto:", "tel:", "data:")):
+        return None
+    url = urljoin(base, href)
+    return url if url.startswith(("http://", "https://")) else None
+
+
+def _json_ld(raw: str, out: List[Any]) -> None:
+    try:
+        out.append(json.loads(raw))
+    except ValueError:
+        pass
+
+
+def _meta(name: str, content: Optional[str], og: Dict[str, str], desc: List[str]) -> None:
+    if content is None:
+        return
+    name = name.lower()
+    if name.startswith("og:"):
+        og.setdefault(name[3:], content.strip())
+    elif name == "description" and not desc:
+        desc.append(content.strip())
+
+
+# ---------------------------------------------------------------------------
+# lxml backend
+# ---------------------------------------------------------------------------
+
+def _extract_lxml(html: str, base_url: str) -> PageContent:
+    doc = lxml.html.document_fromstring(html)
+    base = base_url
+    for b in doc.iter("base"):
+        if b.get("href"):
+            base = urljoin(base_url, b.get("href"))
+            break
+
+    og: Dict[str, str] = {}
+    desc: List[str] = []
+    for m in doc.iter("meta"):
+        _meta(m.get("property") or m.get("name") or "", m.get("content"), og, desc)
+    json_ld: List[Any] = []
+    for s in doc.iter("script"):
+        if (s.get("type") or "").lower() == "application/ld+json" and s.text:
+            _json_ld(s.text, json_ld)
+    links: List[str] = []
+    anchors: Dict[str, str] = {}
+    for a in doc.iter("a"):
+        url = _http_link(base, a.get("href"))
+        if url:
+            links.append(url)
+            if not anchors.get(url):
+                label = a.text_content() or a.get("title") or " ".join(i.get("alt") or "" for i in a.iter("img"))
+                anchors[url] = " ".join(label.split())
+    title_el = doc.find(".//title")
+    title = " ".join(title_el.text_content().split()) if title_el is not None else None
+
+    etree.strip_elements(doc, *SKIP_TAGS, with_tail=False)
+    parts: List[str] = []
+    for event, el in etree.iterwalk(doc, events=("start", "end")):
+        tag = el.tag if isinstance(el.tag, str) else None
+        if event == "start":
+            if tag in BLOCK_TAGS:
+                parts.append("\n")
+            if tag is not None and el.text:
+                parts.append(el.text)
+        else:
+            if tag in BLOCK_TAGS:
+                parts.append("\n")
+            if el.tail:
+                parts.append(el.tail)
+    return PageContent(
+        _clean_text("".join(parts)), links, title or None, desc[0] if desc else None, og, json_ld, anchors
+    )
+
+
+# ---------------------------------------------------------------------------
+# html.parser backend (stdlib, streaming: no tree is built)
+# ---------------------------------------------------------------------------
+
+class _Extractor(HTMLParser):
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base = base_url
+        self.parts: List[str] = []
+        self.links: List[str] = []
+        self.og: Dict[str, str] = {}
+        self.desc: List[str] = []
+        self.json_ld: List[Any] = []
+        self.title: List[str] = []
+        self.anchors: Dict[str, str] = {}
+        self._anchor: Optional[str] = None
+        self._anchor_text: List[str] = []
+        self._skip: Optional[str] = None
+        self._ld: Optional[List[str]] = None
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: List[tuple]) -> None:
+        if self._skip:
+            return
+        a = dict(attrs)
+        if tag in SKIP_TAGS:
+            self._skip = tag
+            if tag == "script" and (a.get("type") or "").lower() == "application/ld+json":
+                self._ld = []
+            return
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag == "a":
+            self._close_anchor()
+            url = _http_link(self.base, a.get("href"))
+            if url:
+                self.links.append(url)
+                self._anchor = url
+                if a.get("title"):
+                    self._anchor_text.append(a["title"])
+        elif tag == "img" and self._anchor and a.get("alt"):
+            self._anchor_text.append(a["alt"])
+        elif tag == "meta":
+            _meta(a.get("property") or a.get("name") or "", a.get("content"), self.og, self.desc)
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "base" and a.get("href") and self.base:
+            self.base = urljoin(self.base, a["href"])
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._skip:
+            if tag == self._skip:
+                if self._ld is not None:
+                    _json_ld("".join(self._ld), self.json_ld)
+                self._skip = None
+                self._ld = None
+            return
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+        if tag == "title":
+            self._in_title = False
+        elif tag == "a":
+            self._close_anchor()
+
+    def _close_anchor(self) -> None:
+        if self._anchor is not None and not self.anchors.get(self._anchor):
+            self.anchors[self._anchor] = " ".join(" ".join(self._anchor_text).split())
+        self._anchor = None
+        self._anchor_text = []
+
+    def handle_data(self, data: str) -> None:
+        if self._skip:
+            if self._ld is not None:
+                self._ld.append(data)
+            return
+        if self._in_title:
+            self.title.append(data)
+        if self._anchor is not None:
+            self._anchor_text.append(data)
+        self.parts.append(data)
+
+
+def _extract_stdlib(html: str, base_url: str) -> PageContent:
+    p = _Extractor(base_url)
+    p.feed(html)
+    p.close()
+    p._close_anchor()
+    title = " ".join("".join(p.title).split()) or None
+    return PageContent(
+        _clean_text("".join(p.parts)), p.links, title, p.desc[0] if p.desc else None, p.og, p.json_ld, p.anchors
+    )
+
+
+def backend() -> str:
+    """Parser in use: HTML_PARSER if set, else lxml when installed, else html.parser."""
+    forced = (os.getenv("HTML_PARSER") or "").strip().lower()
+    if forced in {"lxml", "html.parser"}:
+        return forced if forced != "lxml" or lxml is not None else "html.parser"
+    return "lxml" if lxml is not None else "html.parser"
+
+
+def extract(html: str, base_url: str = "") -> PageContent:
+    """Visible text, absolute links, title, meta description, OpenGraph and JSON-LD in one pass."""
+    if not html or not html.strip():
+        return PageContent("", [], None, None, {}, [], {})
+    if backend() == "lxml":
+        try:
+            return _extract_lxml(html, base_url)
+        except etree.ParserError:
+            pass  # e.g. nothing but a comment; html.parser copes
+        except ValueError as e:
+            print(f"[html_extract] lxml failed ({e}); using html.parser")
+    return _extract_stdlib(html, base_url)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ..cache import DiskCache
+from ..tracing import annotate, counter
+from . import download
+
+
+# Responses without explicit freshness (no max-age/Expires) are reused for
+# 10% of their Last-Modified age, capped here, else for DEFAULT_FRESHNESS.
+HEURISTIC_MAX = float(os.getenv("HTTP_CACHE_HEURISTIC_MAX", str(24 * 3600)))
+DEFAULT_FRESHNESS = float(os.getenv("HTTP_CACHE_DEFAULT_FRESHNESS", "600"))
+# Stale entries are kept this long so they can still be revalidated
+RETAIN_SECONDS = float(os.getenv("HTTP_CACHE_TTL", str(30 * 24 * 3600)))
+
+# Response headers worth keeping with the body
+_KEEP_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Expires", "Date")
+
+_results = counter("clubapply_http_cache_total", "HTTP cache lookups by result (hit, revalidated, miss, stale).")
+
+
+def _cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def freshness(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """Seconds a response may be reused without revalidation; None if it must not be stored."""
+    cc = _cache_control(headers.get("Cache-Control", ""))
+    if "no-store" in cc:
+        return None
+    if "no-cache" in cc:
+        return 0.0
+    try:
+        age = float(headers.get("Age", "0"))
+    except ValueError:
+        age = 0.0
+    if cc.get("max-age") is not None:
+        try:
+            return max(0.0, float(cc["max-age"]) - age)
+        except ValueError:
+            return 0.0
+    date = _http_date(headers.get("Date")) or now
+    expires = _http_date(headers.get("Expires"))
+    if "Expires" in headers:
+        # An unparseable Expires (often "0" or "-1") means already expired
+        return max(0.0, expires - date) if expires is not None else 0.0
+    last_modified = _http_date(headers.get("Last-Modified"))
+    if last_modified is not None:
+        return min(HEURISTIC_MAX, max(0.0, (date - last_modified) * 0.1))
+    return DEFAULT_FRESHNESS
+
+
+def _response(url: str, entry: Dict[str, Any]) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp.headers = CaseInsensitiveDict(entry.get("headers") or {})
+    resp._content = entry["body"].encode("utf-8")
+    resp.encoding = "utf-8"
+    return resp
+
+
+class HTTPCache:
+    """Conditional-request cache for page GETs, stored in a DiskCache.
+
+    Fresh entries are returned without touching the network. Stale entries
+    are revalidated with ``If-None-Match`` / ``If-Modified-Since``; a 304
+    reuses the stored body. If revalidation fails (connection error or 5xx)
+    the stale body is served rather than nothing.
+    """
+
+    def __init__(self, store: DiskCache):
+        self.store = store
+
+    def _save(self, url: str, headers: Mapping[str, str], body: str, now: float) -> None:
+        fresh = freshness(headers, now)
+        if fresh is None:
+            self.store.delete(url)
+            return
+        entry = {
+            "body": body,
+            "headers": {h: headers[h] for h in _KEEP_HEADERS if h in headers},
+            "fresh_until": now + fresh,
+        }
+        self.store.set(url, entry, ttl=max(RETAIN_SECONDS, fresh))
+
+    def _result(self, result: str) -> None:
+        _results.inc({"result": result})
+        annotate(http_cache=result)
+
+    def get(self, session: requests.Session, url: str, timeout: float) -> requests.Response:
+        entry = self.store.get(url)
+        now = time.time()
+        if entry is not None and entry["fresh_until"] > now:
+            self._result("hit")
+            return _response(url, entry)
+
+        conditional: Dict[str, str] = {}
+        if entry is not None:
+            stored = entry.get("headers") or {}
+            if stored.get("ETag"):
+                conditional["If-None-Match"] = stored["ETag"]
+            if stored.get("Last-Modified"):
+                conditional["If-Modified-Since"] = stored["Last-Modified"]
+        try:
+            resp = download.get(session, url, timeout, headers=conditional or None)
+        except (requests.ConnectionError, requests.Timeout):
+            if entry is None:
+                raise
+            self._result("stale")
+            return _response(url, entry)
+
+        if entry is not None and resp.status_code == 304:
+            # Validators and freshness may be updated by the 304's headers
+            merged = {**(entry.get("headers") or {}), **{h: resp.headers[h] for h in _KEEP_HEADERS if h in resp.headers}}
+            self._save(url, merged, entry["body"], now)
+            self._result("revalidated")
+            return _response(url, {**entry, "headers": merged})
+        if entry is not None and resp.status_code >= 500:
+            self._result("stale")
+            return _response(url, entry)
+
+        self._result("miss")
+        # A body cut off at FETCH_MAX_BYTES is not the page its validators
+        # describe; storing it would let every later 304 serve the fragment
+        if resp.status_code == 200 and not getattr(resp, "truncated", False):
+            self._save(url, resp.headers, resp.text, now)
+        return resp
+
+
+_http_cache: Optional[HTTPCache] = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Shared page cache; disabled with HTTP_CACHE=0."""
+    global _http_cache
+    if os.getenv("HTTP_CACHE", "1").lower() in {"0", "false", "no", "off"}:
+        return None
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HTTPCache(
+                DiskCache(
+                    "http_pages",
+                    max_bytes=int(float(os.getenv("HTTP_CACHE_MAX_MB", "128")) * 1024 * 1024),
+                )
+            )
+    return _http_cache
+
+
+def cached_get(session: requests.Session, url: str, timeout: float) -> requests.Response:
+    """Size- and type-checked ``download.get`` through the shared HTTP cache when enabled."""
+    cache = get_http_cache()
+    if cache is None:
+        return download.get(session, url, timeout)
+    return cache.get(session, url, timeout)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+from .html_extract import extract
+
+
+MAX_CAPTIONS = 12
+MAX_CAPTION_CHARS = 300
+
+# First path segments on instagram.com that are not profiles
+_RESERVED = {"p", "reel", "reels", "tv", "explore", "accounts", "stories", "direct", "about", "developer", "legal"}
+_HANDLE = re.compile(r"^[A-Za-z0-9._]{1,30}$")
+_COUNT = r"([\d.,]+\s*[KkMm]?)"
+_OG_COUNTS = {
+    "followers": re.compile(_COUNT + r"\s+Followers", re.IGNORECASE),
+    "following": re.compile(_COUNT + r"\s+Following", re.IGNORECASE),
+    "posts": re.compile(_COUNT + r"\s+Posts", re.IGNORECASE),
+}
+# "... Posts - See Instagram photos and videos from Name (@handle)" carries no bio
+_OG_BOILERPLATE = re.compile(r"^See Instagram photos and videos from", re.IGNORECASE)
+_JSON_SCRIPT = re.compile(
+    r"<script[^>]*type=[\"']application/(?:ld\+)?json[\"'][^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL
+)
+_SHARED_DATA = re.compile(r"window\._sharedData\s*=\s*(\{.*?\})\s*;\s*</script>", re.DOTALL)
+
+
+class InstagramProfile(NamedTuple):
+    """Structured fields from a public profile page; anything missing is None/empty."""
+
+    handle: Optional[str]
+    name: Optional[str] = None
+    bio: Optional[str] = None
+    followers: Optional[int] = None
+    following: Optional[int] = None
+    posts: Optional[int] = None
+    external_url: Optional[str] = None
+    captions: List[str] = []
+
+    def has_signal(self) -> bool:
+        return bool(self.bio or self.captions or self.followers is not None or self.posts is not None)
+
+    def payload(self) -> Dict[str, Any]:
+        """Compact dict for the LLM prompt (empty fields are pruned by compact_json)."""
+        return self._asdict()
+
+    def text(self) -> str:
+        """Plain-text rendering for keyword heuristics."""
+        return "\n".join([p for p in [self.name, self.bio] if p] + self.captions)
+
+
+def handle_from_url(url: Optional[str]) -> Optional[str]:
+    """Lowercase profile handle from an instagram.com URL, ``@handle`` or bare handle."""
+    if not url:
+        return None
+    value = url.strip()
+    if value.startswith("@"):
+        value = value[1:]
+    elif "/" in value or "." in value and "instagram" in value.lower():
+        parts = urlsplit(value if "://" in value else "https://" + value)
+        host = (parts.hostname or "").lower()
+        if host != "instagram.com" and not host.endswith(".instagram.com"):
+            return None
+        segments = [s for s in parts.path.split("/") if s]
+        if not segments or segments[0].lower() in _RESERVED:
+            return None
+        value = segments[0]
+    return value.lower() if _HANDLE.match(value) else None
+
+
+def parse_count(raw: Any) -> Optional[int]:
+    """``1,234`` / ``1.2k`` / ``3M`` / 42 -> int."""
+    if isinstance(raw, bool):
+        return None
+    if isinstance(raw, (int, float)):
+        return int(raw)
+    if not isinstance(raw, str):
+        return None
+    s = raw.strip().replace(",", "").replace(" ", "").lower()
+    scale = 1
+    if s.endswith("k"):
+        scale, s = 1_000, s[:-1]
+    elif s.endswith("m"):
+        scale, s = 1_000_000, s[:-1]
+    try:
+        return int(float(s) * scale)
+    except ValueError:
+        return None
+
+
+def _from_og(desc: str, fields: Dict[str, Any]) -> None:
+    counts, _, rest = desc.partition(" - ")
+    for name, pattern in _OG_COUNTS.items():
+        m = pattern.search(counts)
+        if m and fields.get(name) is None:
+            fields[name] = parse_count(m.group(1))
+    rest = rest.strip()
+    if rest and not _OG_BOILERPLATE.match(rest) and not fields.get("bio"):
+        fields["bio"] = rest.strip('"“” ')
+
+
+def _walk(node: Any, fields: Dict[str, Any], captions: List[str], in_caption: bool = False) -> None:
+    """Pick profile fields out of embedded JSON, whatever its nesting."""
+    if isinstance(node, list):
+        for item in node:
+            _walk(item, fields, captions, in_caption)
+        return
+    if not isinstance(node, dict):
+        return
+    for key in ("biography", "bio"):
+        if isinstance(node.get(key), str) and not fields.get("bio"):
+            fields["bio"] = node[key]
+    if isinstance(node.get("full_name"), str) and not fields.get("name"):
+        fields["name"] = node["full_name"]
+    if isinstance(node.get("external_url"), str) and not fields.get("external_url"):
+        fields["external_url"] = node["external_url"]
+    for key, name in (
+        ("edge_followed_by", "followers"), ("follower_count", "followers"),
+        ("edge_follow", "following"), ("following_count", "following"),
+        ("edge_owner_to_timeline_media", "posts"), ("media_count", "posts"),
+    ):
+        value = node.get(key)
+        count = parse_count(value.get("count") if isinstance(value, dict) else value)
+        if count is not None and fields.get(name) is None:
+            fields[name] = count
+    # schema.org ProfilePage / Person
+    if node.get("@type") in ("ProfilePage", "Person", "Organization"):
+        if isinstance(node.get("description"), str) and not fields.get("bio"):
+            fields["bio"] = node["description"]
+        if isinstance(node.get("name"), str) and not fields.get("name"):
+            fields["name"] = node["name"]
+    if node.get("@type") == "InteractionCounter" and "Follow" in str(node.get("interactionType")):
+        count = parse_count(node.get("userInteractionCount"))
+        if count is not None and fields.get("followers") is None:
+            fields["followers"] = count
+    if in_caption and isinstance(node.get("text"), str) and len(captions) < MAX_CAPTIONS:
+        text = " ".join(node["text"].split())[:MAX_CAPTION_CHARS]
+        if text and text not in captions:
+            captions.append(text)
+    for key, value in node.items():
+        if isinstance(value, (dict, list)):
+            child_caption = in_caption or any(k in key.lower() for k in ("caption", "posts", "media", "items"))
+            _walk(value, fields, captions, child_caption)
+
+
+def parse_profile(html: str, handle: Optional[str] = None) -> InstagramProfile:
+    """Bio, counts and recent captions from og/meta tags and embedded JSON."""
+    page = extract(html)
+    fields: Dict[str, Any] = {}
+    captions: List[str] = []
+    # Embedded JSON first: it has exact counts and the full bio
+    blobs = [m.group(1) for m in _JSON_SCRIPT.finditer(html)] + [m.group(1) for m in _SHARED_DATA.finditer(html)]
+    for raw in blobs:
+        try:
+            _walk(json.loads(raw), fields, captions)
+        except ValueError:
+            continue
+    desc = page.og.get("description") or page.description or ""
+    if desc:
+        _from_og(desc, fields)
+    title = page.og.get("title") or page.title or ""
+    if title and not fields.get("name"):
+        name = re.split(r"\s*\(@|\s+on Instagram|\s+•", title)[0].strip()
+        if name and name.lstrip("@").lower() != (handle or ""):
+            fields["name"] = name
+    return InstagramProfile(handle=handle, captions=captions, **fields)
@@ -1,18 +1,49 @@
 from __future__ import annotations
 
-from typing import Optional
+import io
+import os
+from functools import lru_cache
+from typing import BinaryIO, Optional, Union
 
 import pdfplumber
 
+from ..tracing import span
+
+
+def read_pdf_text(path: Union[str, BinaryIO], max_pages: Optional[int] = None) -> str:
+    with span("pdf_read") as attrs:
+        try:
+            text_parts = []
+            with pdfplumber.open(path) as pdf:
+                pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
+                for p in pages:
+                    text_parts.append(p.extract_text() or "")
+            text = "\n".join(text_parts).strip()
+            attrs.update(pages=len(text_parts), chars=len(text))
+            return text
+        except Exception as e:
+            attrs["outcome"] = "error"
+            return f"PDF_READ_ERROR: {e}"
+
+
+def read_pdf_bytes(data: bytes, max_pages: Optional[int] = None) -> str:
+    """read_pdf_text for a PDF already in memory, e.g. one linked from a club site."""
+    return read_pdf_text(io.BytesIO(data), max_pages=max_pages)
 
-def read_pdf_text(path: str, max_pages: Optional[int] = None) -> str:
-    try:
-        text_parts = []
-        with pdfplumber.open(path) as pdf:
-            pages = pdf.pages if max_pages is None else pdf.pages[:max_pages]
-            for p in pages:
-                text_parts.append(p.extract_text() or "")
-        return "\n".join(text_parts).strip()
-    except Exception as e:
-        return f"PDF_READ_ERROR: {e}"
 
+@lru_cache(maxsize=64)
+def _read_pdf_text_memo(path: str, mtime_ns: int, size: int, max_pages: Optional[int]) -> str:
+    return read_pdf_text(path, max_pages=max_pages)
+
+
+def read_pdf_text_cached(path: str, max_pages: Optional[int] = None) -> str:
+    """Like read_pdf_text, but parses each unchanged file only once per process.
+
+    Entries are keyed on the file's mtime and size, so an edited or replaced
+    resume is re-read.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return read_pdf_text(path, max_pages=max_pages)
+    return _read_pdf_text_memo(os.path.abspath(path), st.st_mtime_ns, st.st_size, max_pages)
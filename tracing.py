@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .schemas import SpanRecord
+
+
+# Span attributes promoted to Prometheus labels. Everything else stays on the
+# span record only, so label cardinality is bounded (no URLs, no prompts).
+METRIC_LABELS = ("stage", "provider", "model")
+# Numeric span attributes that are also summed into ``*_total`` counters.
+METRIC_SUMS = ("prompt_chars", "prompt_tokens", "response_chars", "bytes")
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_collector: ContextVar[Optional[List[SpanRecord]]] = ContextVar("clubapply_spans", default=None)
+_current: ContextVar[Optional[Dict[str, Any]]] = ContextVar("clubapply_span_attrs", default=None)
+
+
+# ---------------------------------------------------------------------------
+# Minimal in-process metrics registry rendered in Prometheus text format
+# ---------------------------------------------------------------------------
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Metric:
+    def __init__(self, name: str, help_text: str, kind: str):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.lock = threading.Lock()
+
+
+class Counter(_Metric):
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text, "counter")
+        self.values: Dict[LabelKey, float] = {}
+
+    def inc(self, labels: Dict[str, str], amount: float = 1.0) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self.lock:
+            return [f"{self.name}{_fmt_labels(k)} {v:g}" for k, v in sorted(self.values.items())]
+
+
+class Histogram(_Metric):
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, "histogram")
+        self.buckets = buckets
+        # labels -> (bucket counts, sum, count)
+        self.values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+
+    def observe(self, labels: Dict[str, str], value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            counts, total, n = self.values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, b in enumerate(self.buckets):
+                if value <= b:
+                    counts[i] += 1
+            self.values[key] = (counts, total + value, n + 1)
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        with self.lock:
+            for key, (counts, total, n) in sorted(self.values.items()):
+                for b, c in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_fmt_labels(key + (('le', f'{b:g}'),))} {c}")
+                lines.append(f"{self.name}_bucket{_fmt_labels(key + (('le', '+Inf'),))} {n}")
+                lines.append(f"{self.name}_sum{_fmt_labels(key)} {total:g}")
+                lines.append(f"{self.name}_count{_fmt_labels(key)} {n}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Current values read at scrape time from ``collect()``."""
+
+    def __init__(self, name: str, help_text: str, collect: Callable[[], List[Tuple[Dict[str, str], float]]]):
+        super().__init__(name, help_text, "gauge")
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        values = [(tuple(sorted(labels.items())), v) for labels, v in self.collect()]
+        return [f"{self.name}{_fmt_labels(k)} {v:g}" for k, v in sorted(values)]
+
+
+def _fmt_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    parts = []
+    for k, v in key:
+        v = str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+_registry: Dict[str, _Metric] = {}
+_registry_lock = threading.Lock()
+
+
+def counter(name: str, help_text: str) -> Counter:
+    with _registry_lock:
+        m = _registry.get(name)
+        if m is None:
+            m = _registry[name] = Counter(name, help_text)
+    return m  # type: ignore[return-value]
+
+
+def histogram(name: str, help_text: str) -> Histogram:
+    with _registry_lock:
+        m = _registry.get(name)
+        if m is None:
+            m = _registry[name] = Histogram(name, help_text)
+    return m  # type: ignore[return-value]
+
+
+def gauge(name: str, help_text: str, collect: Callable[[], List[Tuple[Dict[str, str], float]]]) -> Gauge:
+    with _registry_lock:
+        m = _registry.get(name)
+        if m is None:
+            m = _registry[name] = Gauge(name, help_text, collect)
+    return m  # type: ignore[return-value]
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry.values())
+    lines: List[str] = []
+    for m in sorted(metrics, key=lambda m: m.name):
+        lines.append(f"# HELP {m.name} {m.help}")
+        lines.append(f"# TYPE {m.name} {m.kind}")
+        lines.extend(m.render())  # type: ignore[attr-defined]
+    return "\n".join(lines) + "\n"
+
+
+_span_seconds = histogram("clubapply_span_duration_seconds", "Duration of traced spans by span name.")
+_span_total = counter("clubapply_span_total", "Completed spans by span name and outcome.")
+
+
+def _observe(name: str, attrs: Dict[str, Any], seconds: float) -> None:
+    labels = {"span": name}
+    for k in METRIC_LABELS:
+        if attrs.get(k) is not None:
+            labels[k] = str(attrs[k])
+    _span_seconds.observe(labels, seconds)
+    _span_total.inc({**labels, "outcome": str(attrs.get("outcome", "ok"))})
+    for k in METRIC_SUMS:
+        v = attrs.get(k)
+        if isinstance(v, (int, float)):
+            counter(f"clubapply_{name}_{k}_total", f"Sum of {k} over {name} spans.").inc(labels, v)
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """Time a block, export it as metrics and record it on the active collector.
+
+    Yields the mutable attribute dict; nested code can also add attributes via
+    :func:`annotate`. An ``outcome`` attribute (default ``ok``, ``error`` on
+    exception) feeds the per-outcome counters, e.g. ``fallback`` rates.
+    """
+    record_attrs: Dict[str, Any] = dict(attrs)
+    token = _current.set(record_attrs)
+    start_wall = time.time()
+    start = time.perf_counter()
+    try:
+        yield record_attrs
+    except BaseException as e:
+        record_attrs.setdefault("outcome", "error")
+        record_attrs.setdefault("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _current.reset(token)
+        _observe(name, record_attrs, elapsed)
+        spans = _collector.get()
+        if spans is not None:
+            spans.append(
+                SpanRecord(
+                    name=name,
+                    start=start_wall,
+                    duration_ms=round(elapsed * 1000.0, 3),
+                    attrs=record_attrs,
+                )
+            )
+
+
+def annotate(**attrs: Any) -> None:
+    """Attach attributes to the innermost active span, if any."""
+    current = _current.get()
+    if current is not None:
+        current.update(attrs)
+
+
+@contextmanager
+def collect_spans() -> Iterator[List[SpanRecord]]:
+    """Collect every span finished in this context (including child tasks/threads)."""
+    spans: List[SpanRecord] = []
+    token = _collector.set(spans)
+    try:
+        yield spans
+    finally:
+        _collector.reset(token)